@@ -0,0 +1,28 @@
+"""add_pdf_prefix_hash
+
+Revision ID: 3c1a9e7d5b20
+Revises: ff497bbd6067
+Create Date: 2026-10-15 09:12:41.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1a9e7d5b20'
+down_revision: Union[str, None] = 'ff497bbd6067'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('pdfs', sa.Column('prefix_hash', sa.String(length=64), nullable=True))
+    op.create_index('ix_pdf_size_prefix_hash', 'pdfs', ['file_size_bytes', 'prefix_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_pdf_size_prefix_hash', table_name='pdfs')
+    op.drop_column('pdfs', 'prefix_hash')
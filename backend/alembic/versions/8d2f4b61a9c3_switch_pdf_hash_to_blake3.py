@@ -0,0 +1,53 @@
+"""switch_pdf_hash_to_blake3
+
+Revision ID: 8d2f4b61a9c3
+Revises: 3c1a9e7d5b20
+Create Date: 2026-10-15 10:03:17.204551
+
+"""
+from pathlib import Path
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import blake3
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2f4b61a9c3'
+down_revision: Union[str, None] = '3c1a9e7d5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PREFIX_HASH_BYTES = 64 * 1024
+
+
+def upgrade() -> None:
+    # Existing hashes were SHA-256
+    op.add_column('pdfs', sa.Column('hash_algo', sa.String(length=10), nullable=False, server_default='sha256'))
+
+    # Rehash PDFs still on disk; rows whose file is gone keep their SHA-256 hash
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, file_path FROM pdfs")).fetchall()
+    for pdf_id, file_path in rows:
+        path = Path(file_path)
+        if not path.is_file():
+            continue
+
+        file_hash = blake3.blake3(max_threads=blake3.blake3.AUTO).update_mmap(path).hexdigest()
+        with open(path, 'rb') as f:
+            prefix_hash = blake3.blake3(f.read(PREFIX_HASH_BYTES)).hexdigest()
+
+        conn.execute(
+            sa.text(
+                "UPDATE pdfs SET file_hash = :file_hash, prefix_hash = :prefix_hash, "
+                "hash_algo = 'blake3' WHERE id = :id"
+            ),
+            {"file_hash": file_hash, "prefix_hash": prefix_hash, "id": pdf_id}
+        )
+
+
+def downgrade() -> None:
+    # Rows rehashed to BLAKE3 can't be turned back into SHA-256 once their
+    # file is gone, and leaving them would break duplicate detection
+    raise NotImplementedError("switch_pdf_hash_to_blake3 is irreversible")
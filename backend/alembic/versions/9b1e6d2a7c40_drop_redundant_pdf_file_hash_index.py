@@ -0,0 +1,26 @@
+"""drop_redundant_pdf_file_hash_index
+
+Revision ID: 9b1e6d2a7c40
+Revises: e5a83c17f4b2
+Create Date: 2026-10-15 23:05:12.418803
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9b1e6d2a7c40'
+down_revision: Union[str, None] = 'e5a83c17f4b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # uq_pdf_file_hash's unique index already serves file_hash lookups
+    op.drop_index(op.f('ix_pdfs_file_hash'), table_name='pdfs')
+
+
+def downgrade() -> None:
+    op.create_index(op.f('ix_pdfs_file_hash'), 'pdfs', ['file_hash'], unique=False)
@@ -0,0 +1,29 @@
+"""drop_pdf_hash_algo
+
+Revision ID: a71e3c5f9d28
+Revises: d2b7e5f1a064
+Create Date: 2026-10-15 23:58:06.412903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a71e3c5f9d28'
+down_revision: Union[str, None] = 'd2b7e5f1a064'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nothing reads hash_algo: duplicate lookups only compare BLAKE3 hashes, so
+    # legacy SHA-256 rows (files gone before the BLAKE3 rehash) never match
+    op.drop_column('pdfs', 'hash_algo')
+
+
+def downgrade() -> None:
+    # Legacy SHA-256 rows can no longer be told apart; label everything BLAKE3
+    op.add_column('pdfs', sa.Column('hash_algo', sa.String(length=10), nullable=False, server_default='blake3'))
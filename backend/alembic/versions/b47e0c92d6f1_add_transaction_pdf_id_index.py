@@ -0,0 +1,25 @@
+"""add_transaction_pdf_id_index
+
+Revision ID: b47e0c92d6f1
+Revises: 8d2f4b61a9c3
+Create Date: 2026-10-15 10:41:52.873016
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b47e0c92d6f1'
+down_revision: Union[str, None] = '8d2f4b61a9c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_transactions_pdf_id'), 'transactions', ['pdf_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_transactions_pdf_id'), table_name='transactions')
@@ -0,0 +1,28 @@
+"""add_match_transaction_indexes
+
+Revision ID: c6f0a4e9d813
+Revises: 9b1e6d2a7c40
+Create Date: 2026-10-15 23:12:37.902214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c6f0a4e9d813'
+down_revision: Union[str, None] = '9b1e6d2a7c40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Matches are looked up by either side's transaction when a PDF is reset or counted
+    op.create_index('ix_matches_car_transaction_id', 'matches', ['car_transaction_id'], unique=False)
+    op.create_index('ix_matches_receipt_transaction_id', 'matches', ['receipt_transaction_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_matches_receipt_transaction_id', table_name='matches')
+    op.drop_index('ix_matches_car_transaction_id', table_name='matches')
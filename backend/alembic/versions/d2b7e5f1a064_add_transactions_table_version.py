@@ -0,0 +1,46 @@
+"""add_transactions_table_version
+
+Revision ID: d2b7e5f1a064
+Revises: c6f0a4e9d813
+Create Date: 2026-10-15 23:24:51.207316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2b7e5f1a064'
+down_revision: Union[str, None] = 'c6f0a4e9d813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same triggers as models.transaction.TRANSACTION_VERSION_TRIGGERS
+_TRIGGER_OPERATIONS = ("INSERT", "UPDATE", "DELETE")
+
+
+def upgrade() -> None:
+    op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=50), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    op.execute("INSERT INTO table_versions (table_name, version) VALUES ('transactions', 0)")
+
+    for operation in _TRIGGER_OPERATIONS:
+        op.execute(
+            f"CREATE TRIGGER trg_transactions_version_{operation.lower()} "
+            f"AFTER {operation} ON transactions "
+            "BEGIN "
+            "INSERT INTO table_versions (table_name, version) VALUES ('transactions', 1) "
+            "ON CONFLICT (table_name) DO UPDATE SET version = version + 1; "
+            "END"
+        )
+
+
+def downgrade() -> None:
+    for operation in _TRIGGER_OPERATIONS:
+        op.execute(f"DROP TRIGGER IF EXISTS trg_transactions_version_{operation.lower()}")
+    op.drop_table('table_versions')
@@ -0,0 +1,39 @@
+"""add_transaction_and_match_filter_indexes
+
+Revision ID: e5a83c17f4b2
+Revises: b47e0c92d6f1
+Create Date: 2026-10-15 22:44:09.615380
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a83c17f4b2'
+down_revision: Union[str, None] = 'b47e0c92d6f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (pdf_id, is_matched) covers pdf_id-only lookups too
+    op.create_index('ix_transactions_pdf_matched', 'transactions', ['pdf_id', 'is_matched'], unique=False)
+    op.drop_index(op.f('ix_transactions_pdf_id'), table_name='transactions')
+    op.create_index('ix_transactions_type_matched', 'transactions', ['transaction_type', 'is_matched'], unique=False)
+
+    # Duplicate of ix_transactions_content_fingerprint
+    op.drop_index('idx_content_fingerprint', table_name='transactions')
+
+    op.create_index('ix_matches_status', 'matches', ['status'], unique=False)
+    op.create_index('ix_matches_exported', 'matches', ['exported'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_matches_exported', table_name='matches')
+    op.drop_index('ix_matches_status', table_name='matches')
+    op.create_index('idx_content_fingerprint', 'transactions', ['content_fingerprint'], unique=False)
+    op.drop_index('ix_transactions_type_matched', table_name='transactions')
+    op.create_index(op.f('ix_transactions_pdf_id'), 'transactions', ['pdf_id'], unique=False)
+    op.drop_index('ix_transactions_pdf_matched', table_name='transactions')
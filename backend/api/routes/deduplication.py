@@ -1,21 +1,56 @@
 """
 API routes for deduplication management.
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Request, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
+import operator
+import os
+import time
 
 from models.base import get_db
 from models.pdf import PDF
-from models.transaction import Transaction
+from models.transaction import Transaction, TableVersion
 from services.deduplication_service import deduplication_service
 from services.pdf_service import pdf_service
 
 router = APIRouter(prefix="/api/dedup", tags=["deduplication"])
 
+# Seconds a serialized find-duplicates payload is reused while the
+# transactions table version is unchanged
+DUPLICATE_GROUPS_CACHE_TTL = 60
+
+# Fields serialized per transaction in find-duplicates (one C-level call per row)
+_duplicate_row_fields = operator.attrgetter(
+    'id', 'date', 'amount', 'employee_id', 'merchant', 'pdf_id', 'is_matched'
+)
+
+# (etag, expires_at, payload) of the last find-duplicates response
+_duplicate_groups_cache: Optional[Tuple[str, float, Dict[str, Any]]] = None
+
+
+def invalidate_duplicate_groups_cache():
+    """Drop the cached find-duplicates payload after transactions change."""
+    global _duplicate_groups_cache
+    _duplicate_groups_cache = None
+
+
+def _duplicate_groups_etag(db: Session) -> str:
+    """
+    Build an ETag from the transactions table version.
+
+    Triggers bump the version on every insert, update and delete, so the
+    ETag changes with each committed write, whichever process made it.
+    """
+    version = db.query(TableVersion.version).filter(
+        TableVersion.table_name == Transaction.__tablename__
+    ).scalar()
+
+    return f'"transactions-v{version or 0}"'
+
 
 @router.post("/check-file")
-async def check_file_for_duplicates(
+def check_file_for_duplicates(
     file: UploadFile = File(...),
     db: Session = Depends(get_db)
 ):
@@ -25,14 +60,18 @@ async def check_file_for_duplicates(
     Useful for client-side duplicate detection before upload.
     """
     try:
-        # Read file content
-        content = await file.read()
-
-        # Calculate hash
-        file_hash = deduplication_service.calculate_file_hash_from_bytes(content)
-
-        # Check for duplicate
-        duplicate_pdf = deduplication_service.check_duplicate_pdf(file_hash, db)
+        # Cheap pre-check on size + first 64KB; only hash the whole file
+        # when a stored PDF could actually match
+        file_size = file.file.seek(0, os.SEEK_END)
+        file.file.seek(0)
+        prefix_hash = deduplication_service.calculate_prefix_hash(file.file)
+
+        duplicate_pdf = None
+        if deduplication_service.check_duplicate_by_prefix(file_size, prefix_hash, db):
+            # Hash the spooled upload directly (avoids loading it into memory)
+            file.file.seek(0)
+            file_hash = deduplication_service.calculate_file_hash_from_fileobj(file.file)
+            duplicate_pdf = deduplication_service.check_duplicate_pdf(file_hash, db)
 
         if duplicate_pdf:
             transaction_count = db.query(Transaction).filter(
@@ -65,45 +104,86 @@ async def check_file_for_duplicates(
         )
 
 
+@router.head("/by-hash/{file_hash}")
+def check_pdf_by_hash(file_hash: str, db: Session = Depends(get_db)):
+    """
+    Check whether a PDF with this BLAKE3 file hash is already stored.
+
+    Lets clients that hash files locally skip uploading duplicates entirely.
+
+    Returns:
+        Empty 200 response with the stored PDF's ID in X-PDF-Id, or 404
+    """
+    duplicate_pdf = deduplication_service.check_duplicate_pdf(file_hash.lower(), db)
+
+    if not duplicate_pdf:
+        return Response(status_code=status.HTTP_404_NOT_FOUND)
+
+    return Response(status_code=status.HTTP_200_OK, headers={"X-PDF-Id": duplicate_pdf.id})
+
+
 @router.get("/find-duplicates")
-async def find_duplicate_transactions(
+def find_duplicate_transactions(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
     Find all duplicate transaction groups in the database.
 
-    Returns groups of transactions with identical fingerprints.
+    Returns groups of transactions with identical fingerprints. Responses
+    carry an ETag; a matching If-None-Match returns 304 with no body, and
+    the serialized payload is reused while transactions are unchanged.
     """
+    global _duplicate_groups_cache
+
+    etag = _duplicate_groups_etag(db)
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+
+    cached = _duplicate_groups_cache
+    if cached and cached[0] == etag and cached[1] > time.monotonic():
+        return cached[2]
+
     duplicate_groups = deduplication_service.find_all_duplicates(db)
 
     result = []
     for fingerprint, transactions in duplicate_groups:
+        rows = []
+        for t in transactions:
+            tid, tdate, amount, employee_id, merchant, pdf_id, is_matched = _duplicate_row_fields(t)
+            rows.append({
+                "transaction_id": tid,
+                "date": tdate.isoformat() if tdate else None,
+                "amount": amount,
+                "employee_id": employee_id,
+                "merchant": merchant,
+                "pdf_id": pdf_id,
+                "is_matched": is_matched
+            })
+
         result.append({
             "fingerprint": fingerprint,
             "count": len(transactions),
-            "transactions": [
-                {
-                    "transaction_id": t.id,
-                    "date": t.date.isoformat() if t.date else None,
-                    "amount": t.amount,
-                    "employee_id": t.employee_id,
-                    "merchant": t.merchant,
-                    "pdf_id": t.pdf_id,
-                    "is_matched": t.is_matched
-                }
-                for t in transactions
-            ]
+            "transactions": rows
         })
 
-    return {
+    payload = {
         "duplicate_groups": result,
         "total_groups": len(result),
         "total_duplicates": sum(len(group["transactions"]) for group in result)
     }
 
+    _duplicate_groups_cache = (etag, time.monotonic() + DUPLICATE_GROUPS_CACHE_TTL, payload)
+
+    return payload
+
 
 @router.delete("/transaction/{transaction_id}")
-async def delete_duplicate_transaction(
+def delete_duplicate_transaction(
     transaction_id: str,
     force: bool = False,
     db: Session = Depends(get_db)
@@ -129,6 +209,7 @@ async def delete_duplicate_transaction(
 
     db.delete(transaction)
     db.commit()
+    invalidate_duplicate_groups_cache()
 
     return {
         "message": "Transaction deleted successfully",
@@ -1,20 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from fastapi.responses import FileResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import update
+from sqlalchemy.orm import Session, selectinload
 from pathlib import Path
 from datetime import datetime
 from typing import List
+import os
 
 from models.base import get_db
-from models.transaction import Match
+from models.transaction import Match, Transaction
 from models.pdf import PDF
-from services.splitting_service import splitting_service, SplittingError
+from services.splitting_service import splitting_service, SplittingError, SourcePDFNotFoundError
+from services.job_service import job_service
+from api.routes.jobs import run_job
 
 router = APIRouter(prefix="/api/export", tags=["export"])
 
+# Eager-load both transactions and their source PDFs so batch exports
+# resolve file paths without a PDF lookup per match
+MATCH_PDF_LOAD_OPTIONS = (
+    selectinload(Match.car_transaction).joinedload(Transaction.pdf),
+    selectinload(Match.receipt_transaction).joinedload(Transaction.pdf),
+)
+
+
+def build_matches_data(matches: List[Match]) -> List[dict]:
+    """
+    Build splitting-service input for matches loaded with MATCH_PDF_LOAD_OPTIONS.
+
+    Matches whose source PDFs no longer exist are skipped.
+    """
+    matches_data = []
+    for match in matches:
+        car_pdf = match.car_transaction.pdf
+        receipt_pdf = match.receipt_transaction.pdf
+
+        if not car_pdf or not receipt_pdf:
+            continue
+
+        matches_data.append({
+            'match_id': match.id,
+            'car_pdf_path': Path(car_pdf.file_path),
+            'car_pages': [match.car_transaction.page_number],
+            'receipt_pdf_path': Path(receipt_pdf.file_path),
+            'receipt_pages': [match.receipt_transaction.page_number]
+        })
+
+    return matches_data
+
 
 @router.post("/match/{match_id}")
-async def export_match(
+def export_match(
     match_id: str,
     db: Session = Depends(get_db)
 ):
@@ -54,22 +90,12 @@ async def export_match(
             detail="Source PDF files not found in database"
         )
 
-    # Verify files exist on disk
-    car_path = Path(car_pdf.file_path)
-    receipt_path = Path(receipt_pdf.file_path)
-
-    if not car_path.exists() or not receipt_path.exists():
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Source PDF files not found on disk"
-        )
-
-    # Create the split PDF
+    # Create the split PDF (a missing source file raises SourcePDFNotFoundError)
     try:
         output_path, total_pages = splitting_service.create_match_pdf(
-            car_pdf_path=car_path,
+            car_pdf_path=Path(car_pdf.file_path),
             car_page_numbers=[car_trans.page_number],
-            receipt_pdf_path=receipt_path,
+            receipt_pdf_path=Path(receipt_pdf.file_path),
             receipt_page_numbers=[receipt_trans.page_number],
             match_id=match_id
         )
@@ -91,6 +117,11 @@ async def export_match(
             "exported_at": match.exported_at.isoformat()
         }
 
+    except SourcePDFNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Source PDF files not found on disk"
+        )
     except SplittingError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -102,7 +133,7 @@ async def export_match(
 
 
 @router.post("/matches/batch")
-async def export_batch_matches(
+def export_batch_matches(
     match_ids: List[str],
     db: Session = Depends(get_db)
 ):
@@ -121,7 +152,9 @@ async def export_batch_matches(
         HTTPException: If no valid matches found (404) or export fails (500)
     """
     # Get matches
-    matches = db.query(Match).filter(Match.id.in_(match_ids)).all()
+    matches = db.query(Match).options(*MATCH_PDF_LOAD_OPTIONS).filter(
+        Match.id.in_(match_ids)
+    ).all()
 
     if not matches:
         raise HTTPException(
@@ -130,21 +163,7 @@ async def export_batch_matches(
         )
 
     # Prepare data for batch export
-    matches_data = []
-    for match in matches:
-        car_pdf = db.query(PDF).filter(PDF.id == match.car_transaction.pdf_id).first()
-        receipt_pdf = db.query(PDF).filter(PDF.id == match.receipt_transaction.pdf_id).first()
-
-        if not car_pdf or not receipt_pdf:
-            continue
-
-        matches_data.append({
-            'match_id': match.id,
-            'car_pdf_path': Path(car_pdf.file_path),
-            'car_pages': [match.car_transaction.page_number],
-            'receipt_pdf_path': Path(receipt_pdf.file_path),
-            'receipt_pages': [match.receipt_transaction.page_number]
-        })
+    matches_data = build_matches_data(matches)
 
     if not matches_data:
         raise HTTPException(
@@ -152,18 +171,29 @@ async def export_batch_matches(
             detail="No valid match data found"
         )
 
+    # Release the connection while merging; the session reconnects for the update
+    db.close()
+
     # Create batch PDFs
     try:
         results = splitting_service.create_batch_pdfs(matches_data)
 
-        # Update match records
-        for match_id, output_path, total_pages in results:
-            match = db.query(Match).filter(Match.id == match_id).first()
-            if match:
-                match.exported = True
-                match.export_path = str(output_path.absolute())
-                match.exported_at = datetime.now()
-                match.status = 'exported'
+        # Update match records (single bulk UPDATE by primary key); the
+        # whole batch shares one export timestamp. Resolve against the cwd
+        # once instead of calling Path.absolute() (getcwd) per row.
+        exported_at = datetime.now()
+        cwd = os.getcwd()
+        if results:
+            db.execute(update(Match), [
+                {
+                    "id": match_id,
+                    "exported": True,
+                    "export_path": os.path.join(cwd, output_path),
+                    "exported_at": exported_at,
+                    "status": 'exported'
+                }
+                for match_id, output_path, total_pages in results
+            ])
 
         db.commit()
 
@@ -192,7 +222,7 @@ async def export_batch_matches(
 
 
 @router.post("/matches/all-in-one")
-async def export_all_in_one(
+def export_all_in_one(
     match_ids: List[str] = None,
     db: Session = Depends(get_db)
 ):
@@ -209,11 +239,12 @@ async def export_all_in_one(
         HTTPException: If no matches found (404) or export fails (500)
     """
     # Get matches
+    query = db.query(Match).options(*MATCH_PDF_LOAD_OPTIONS)
     if match_ids:
-        matches = db.query(Match).filter(Match.id.in_(match_ids)).all()
+        matches = query.filter(Match.id.in_(match_ids)).all()
     else:
         # Default to all approved matches
-        matches = db.query(Match).filter(Match.status == 'approved').all()
+        matches = query.filter(Match.status == 'approved').all()
 
     if not matches:
         raise HTTPException(
@@ -222,21 +253,7 @@ async def export_all_in_one(
         )
 
     # Prepare data
-    matches_data = []
-    for match in matches:
-        car_pdf = db.query(PDF).filter(PDF.id == match.car_transaction.pdf_id).first()
-        receipt_pdf = db.query(PDF).filter(PDF.id == match.receipt_transaction.pdf_id).first()
-
-        if not car_pdf or not receipt_pdf:
-            continue
-
-        matches_data.append({
-            'match_id': match.id,
-            'car_pdf_path': Path(car_pdf.file_path),
-            'car_pages': [match.car_transaction.page_number],
-            'receipt_pdf_path': Path(receipt_pdf.file_path),
-            'receipt_pages': [match.receipt_transaction.page_number]
-        })
+    matches_data = build_matches_data(matches)
 
     if not matches_data:
         raise HTTPException(
@@ -244,21 +261,28 @@ async def export_all_in_one(
             detail="No valid match data found"
         )
 
+    # Release the connection while merging; the session reconnects for the update
+    exported_ids = [match.id for match in matches]
+    db.close()
+
     # Create combined PDF
     try:
         output_path, total_pages = splitting_service.create_all_in_one_pdf(matches_data)
 
         # Update all match records
-        for match in matches:
-            match.exported = True
-            match.exported_at = datetime.now()
-            match.status = 'exported'
+        db.query(Match).filter(
+            Match.id.in_(exported_ids)
+        ).update({
+            Match.exported: True,
+            Match.exported_at: datetime.now(),
+            Match.status: 'exported'
+        }, synchronize_session=False)
 
         db.commit()
 
         return {
-            "message": f"Exported {len(matches)} matches into single PDF",
-            "match_count": len(matches),
+            "message": f"Exported {len(exported_ids)} matches into single PDF",
+            "match_count": len(exported_ids),
             "export_path": str(output_path),
             "total_pages": total_pages
         }
@@ -273,8 +297,31 @@ async def export_all_in_one(
         )
 
 
+@router.post("/matches/all-in-one/async", status_code=status.HTTP_202_ACCEPTED)
+def queue_export_all_in_one(
+    background_tasks: BackgroundTasks,
+    match_ids: List[str] = None
+):
+    """
+    Queue a combined all-in-one export as a background job.
+
+    Returns immediately; poll GET /api/jobs/{job_id} for the result, which
+    has the same shape as the synchronous all-in-one export response.
+
+    Args:
+        match_ids: List of match UUIDs (optional, defaults to all approved matches)
+
+    Returns:
+        Job metadata with job_id and state 'queued'
+    """
+    job = job_service.create_job("export", {"match_ids": match_ids})
+    background_tasks.add_task(run_job, job.id, export_all_in_one, match_ids)
+
+    return job.to_dict()
+
+
 @router.get("/download/{match_id}")
-async def download_match(
+def download_match(
     match_id: str,
     db: Session = Depends(get_db)
 ):
@@ -306,7 +353,11 @@ async def download_match(
 
     export_path = Path(match.export_path)
 
-    if not export_path.exists():
+    # Stat once here and hand the result to FileResponse, which otherwise
+    # stats the file again before streaming it in chunks off the event loop
+    try:
+        stat_result = os.stat(export_path)
+    except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Export file not found on disk"
@@ -315,5 +366,6 @@ async def download_match(
     return FileResponse(
         path=export_path,
         media_type='application/pdf',
-        filename=export_path.name
+        filename=export_path.name,
+        stat_result=stat_result
     )
@@ -1,16 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import insert, func, select
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 from pathlib import Path
-from typing import List
+from collections import Counter
+from typing import List, Optional
 import logging
 
 from models.base import get_db
 from models.pdf import PDF
 from models.transaction import Transaction
-from schemas.transaction import TransactionResponse, TransactionListResponse
+from schemas.transaction import TransactionListResponse
 from services.extraction_service import extraction_service, ExtractionError
 from services.deduplication_service import deduplication_service
+from services.job_service import job_service
+from api.routes.jobs import run_job
+from api.routes.deduplication import invalidate_duplicate_groups_cache
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +24,7 @@ router = APIRouter(prefix="/api/extract", tags=["extraction"])
 
 
 @router.post("/pdf/{pdf_id}", response_model=TransactionListResponse)
-async def extract_pdf_transactions(
+def extract_pdf_transactions(
     pdf_id: str,
     db: Session = Depends(get_db)
 ):
@@ -45,85 +51,132 @@ async def extract_pdf_transactions(
             detail=f"PDF with id {pdf_id} not found"
         )
 
-    # Check if already extracted
-    existing_count = db.query(Transaction).filter(Transaction.pdf_id == pdf_id).count()
-    if existing_count > 0:
+    # Check if already extracted (EXISTS stops at the first row; only
+    # count them when reporting the error)
+    already_extracted = db.scalar(
+        select(select(Transaction.id).where(Transaction.pdf_id == pdf_id).exists())
+    )
+    if already_extracted:
+        existing_count = db.query(Transaction).filter(Transaction.pdf_id == pdf_id).count()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Transactions already extracted for this PDF. Found {existing_count} existing transactions."
         )
 
+    return _extract_and_persist(pdf_record, db)
+
+
+def _extract_and_persist(pdf_record: PDF, db: Session):
+    """
+    Extract transactions from a PDF and save the non-duplicate ones.
+
+    Shared by the extract and force re-extract endpoints. Callers have
+    already loaded the PDF record and decided extraction should proceed;
+    this commits the inserted rows (and any pending changes in the session).
+
+    Args:
+        pdf_record: PDF to extract from
+        db: Database session
+
+    Returns:
+        TransactionListResponse payload as an ORJSONResponse
+
+    Raises:
+        HTTPException: If PDF file is missing (404) or extraction fails (500)
+    """
+    pdf_id = pdf_record.id
+
     # Extract transactions
     try:
-        pdf_path = Path(pdf_record.file_path)
-        if not pdf_path.exists():
+        # No existence pre-check: a missing file surfaces as FileNotFoundError
+        try:
+            extracted = extraction_service.extract_transactions(
+                Path(pdf_record.file_path),
+                pdf_record.pdf_type
+            )
+        except FileNotFoundError:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="PDF file not found on disk"
             )
 
-        extracted = extraction_service.extract_transactions(
-            pdf_path,
-            pdf_record.pdf_type
-        )
-
         # Save to database with deduplication
-        transaction_records = []
+        new_rows = []
         duplicate_count = 0
         duplicates_info = []
 
-        for trans in extracted:
-            # Calculate fingerprint
-            trans_data = {
+        # Calculate all fingerprints, then check them in one query
+        fingerprints = [
+            deduplication_service.calculate_transaction_fingerprint({
                 'date': trans.date,  # Already a date object from extraction service
                 'amount': trans.amount,
                 'employee_id': trans.employee_id,
                 'transaction_type': trans.transaction_type
-            }
-            fingerprint = deduplication_service.calculate_transaction_fingerprint(trans_data)
+            })
+            for trans in extracted
+        ]
+        existing_ids = deduplication_service.check_duplicates_bulk(fingerprints, db)
+
+        # Fingerprints already queued from this PDF (a repeated line would
+        # otherwise be inserted twice and violate uq_transaction_content)
+        queued_fingerprints = set()
 
-            # Check for existing transaction
-            existing = deduplication_service.check_duplicate_transaction(fingerprint, db)
+        for trans, fingerprint in zip(extracted, fingerprints):
+            if fingerprint in queued_fingerprints:
+                duplicate_count += 1
+                logger.info(f"Skipping repeated transaction within PDF: {fingerprint[:16]}...")
+                continue
+
+            existing_id = existing_ids.get(fingerprint)
 
-            if existing:
+            if existing_id:
                 duplicate_count += 1
                 duplicates_info.append({
                     'date': trans.date.isoformat() if trans.date else None,
                     'amount': trans.amount,
                     'merchant': trans.merchant,
-                    'existing_transaction_id': existing.id
+                    'existing_transaction_id': existing_id
                 })
                 logger.info(f"Skipping duplicate transaction: {fingerprint[:16]}...")
                 continue  # Skip inserting duplicate
 
-            # Create transaction with fingerprint
-            transaction = Transaction(
-                pdf_id=pdf_id,
-                transaction_type=trans.transaction_type,
-                date=trans.date,  # Already a date object from extraction service
-                amount=trans.amount,
-                employee_id=trans.employee_id,
-                employee_name=trans.employee_name,
-                merchant=trans.merchant,
-                card_number=trans.card_number,
-                receipt_id=trans.receipt_id,
-                page_number=trans.page_number,
-                raw_text=trans.raw_text,
-                extraction_confidence=trans.extraction_confidence,
-                content_fingerprint=fingerprint  # NEW
-            )
-            db.add(transaction)
-            transaction_records.append(transaction)
+            # Queue transaction row with fingerprint
+            queued_fingerprints.add(fingerprint)
+            new_rows.append({
+                'pdf_id': pdf_id,
+                'transaction_type': trans.transaction_type,
+                'date': trans.date,  # Already a date object from extraction service
+                'amount': trans.amount,
+                'employee_id': trans.employee_id,
+                'employee_name': trans.employee_name,
+                'merchant': trans.merchant,
+                'card_number': trans.card_number,
+                'receipt_id': trans.receipt_id,
+                'page_number': trans.page_number,
+                'raw_text': trans.raw_text,
+                'extraction_confidence': trans.extraction_confidence,
+                'content_fingerprint': fingerprint
+            })
+
+        # Bulk insert in one statement; RETURNING yields IDs and server
+        # timestamps without a refresh query per row
+        transaction_records = []
+        if new_rows:
+            transaction_records = db.scalars(
+                insert(Transaction).returning(Transaction),
+                new_rows
+            ).all()
 
-        db.commit()
+        # Serialize before commit expires the loaded attributes
+        transaction_responses = [t.to_response_dict() for t in transaction_records]
 
-        # Refresh to get IDs and timestamps
-        for transaction in transaction_records:
-            db.refresh(transaction)
+        db.commit()
+        invalidate_duplicate_groups_cache()
 
-        # Get counts
-        car_count = sum(1 for t in transaction_records if t.transaction_type == 'car')
-        receipt_count = sum(1 for t in transaction_records if t.transaction_type == 'receipt')
+        # Get counts (single pass over the inserted rows)
+        type_counts = Counter(row['transaction_type'] for row in new_rows)
+        car_count = type_counts['car']
+        receipt_count = type_counts['receipt']
 
         # Log duplicate info
         if duplicate_count > 0:
@@ -132,17 +185,19 @@ async def extract_pdf_transactions(
                 f"skipped {duplicate_count} duplicates from PDF {pdf_id}"
             )
 
-        return TransactionListResponse(
-            transactions=[TransactionResponse.model_validate(t) for t in transaction_records],
-            total_count=len(transaction_records),
-            car_count=car_count,
-            receipt_count=receipt_count,
-            unmatched_count=len(transaction_records)  # All unmatched initially
-        )
-
+        # Trusted DB rows: skip response_model validation and encode directly
+        return ORJSONResponse({
+            "transactions": transaction_responses,
+            "total_count": len(transaction_records),
+            "car_count": car_count,
+            "receipt_count": receipt_count,
+            "unmatched_count": len(transaction_records),  # All unmatched initially
+            "duplicates_skipped": duplicate_count
+        })
+
+    except HTTPException:
+        raise
     except ExtractionError as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Extraction error for PDF {pdf_id}: {str(e)}")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -153,8 +208,6 @@ async def extract_pdf_transactions(
             }
         )
     except Exception as e:
-        import logging
-        logger = logging.getLogger(__name__)
         logger.error(f"Unexpected error during extraction for PDF {pdf_id}: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -166,11 +219,53 @@ async def extract_pdf_transactions(
         )
 
 
+@router.post("/pdf/{pdf_id}/async", status_code=status.HTTP_202_ACCEPTED)
+def queue_pdf_extraction(
+    pdf_id: str,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """
+    Queue transaction extraction for an uploaded PDF as a background job.
+
+    Returns immediately; poll GET /api/jobs/{job_id} (or GET /status/{pdf_id})
+    for the result, which has the same shape as the synchronous extraction
+    response. If an extraction job is already queued or running for the
+    PDF, that job is returned instead of queueing another.
+
+    Args:
+        pdf_id: UUID of uploaded PDF
+
+    Returns:
+        Job metadata with job_id and state 'queued'
+
+    Raises:
+        HTTPException: If PDF not found (404)
+    """
+    if not db.query(PDF.id).filter(PDF.id == pdf_id).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"PDF with id {pdf_id} not found"
+        )
+
+    # Don't queue a second extraction while one is pending for this PDF
+    active_job = job_service.find_latest_job("extraction", pdf_id=pdf_id)
+    if active_job and active_job.state in ("queued", "running"):
+        return active_job.to_dict()
+
+    job = job_service.create_job("extraction", {"pdf_id": pdf_id})
+    background_tasks.add_task(run_job, job.id, extract_pdf_transactions, pdf_id)
+
+    return job.to_dict()
+
+
 @router.get("/transactions", response_model=TransactionListResponse)
-async def get_all_transactions(
+def get_all_transactions(
     pdf_id: str = None,
     transaction_type: str = None,
     unmatched_only: bool = False,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db)
 ):
     """
@@ -180,9 +275,12 @@ async def get_all_transactions(
         pdf_id: Filter by PDF ID (optional)
         transaction_type: Filter by type 'car' or 'receipt' (optional)
         unmatched_only: Only return unmatched transactions (optional)
+        limit: Maximum number of transactions to return (optional)
+        offset: Number of transactions to skip (default: 0)
 
     Returns:
-        TransactionListResponse with filtered transactions
+        TransactionListResponse with filtered transactions.
+        Counts cover all matching transactions, not just the returned page.
     """
     query = db.query(Transaction)
 
@@ -195,24 +293,48 @@ async def get_all_transactions(
     if unmatched_only:
         query = query.filter(Transaction.is_matched == False)
 
-    transactions = query.order_by(Transaction.date, Transaction.created_at).all()
-
-    # Calculate counts
-    car_count = sum(1 for t in transactions if t.transaction_type == 'car')
-    receipt_count = sum(1 for t in transactions if t.transaction_type == 'receipt')
-    unmatched_count = sum(1 for t in transactions if not t.is_matched)
+    # Calculate counts in SQL (one row per type/matched combination)
+    count_rows = query.with_entities(
+        Transaction.transaction_type,
+        Transaction.is_matched,
+        func.count(Transaction.id)
+    ).group_by(
+        Transaction.transaction_type,
+        Transaction.is_matched
+    ).all()
 
-    return TransactionListResponse(
-        transactions=[TransactionResponse.model_validate(t) for t in transactions],
-        total_count=len(transactions),
-        car_count=car_count,
-        receipt_count=receipt_count,
-        unmatched_count=unmatched_count
-    )
+    total_count = 0
+    car_count = 0
+    receipt_count = 0
+    unmatched_count = 0
+    for row_type, row_matched, row_count in count_rows:
+        total_count += row_count
+        if row_type == 'car':
+            car_count += row_count
+        elif row_type == 'receipt':
+            receipt_count += row_count
+        if not row_matched:
+            unmatched_count += row_count
+
+    page_query = query.order_by(Transaction.date, Transaction.created_at).offset(offset)
+    if limit is not None:
+        page_query = page_query.limit(limit)
+
+    transactions = page_query.all()
+
+    # Trusted DB rows: skip response_model validation and encode directly
+    return ORJSONResponse({
+        "transactions": [t.to_response_dict() for t in transactions],
+        "total_count": total_count,
+        "car_count": car_count,
+        "receipt_count": receipt_count,
+        "unmatched_count": unmatched_count,
+        "duplicates_skipped": 0
+    })
 
 
 @router.delete("/transactions/{transaction_id}")
-async def delete_transaction(
+def delete_transaction(
     transaction_id: str,
     db: Session = Depends(get_db)
 ):
@@ -244,12 +366,13 @@ async def delete_transaction(
 
     db.delete(transaction)
     db.commit()
+    invalidate_duplicate_groups_cache()
 
     return {"message": "Transaction deleted successfully", "transaction_id": transaction_id}
 
 
 @router.post("/force/{pdf_id}", response_model=TransactionListResponse)
-async def force_reextract_transactions(
+def force_reextract_transactions(
     pdf_id: str,
     delete_matched: bool = False,
     db: Session = Depends(get_db)
@@ -283,13 +406,20 @@ async def force_reextract_transactions(
             }
         )
 
-    # Check for matched transactions
-    matched_count = db.query(Transaction).filter(
-        Transaction.pdf_id == pdf_id,
-        Transaction.is_matched == True
-    ).count()
+    # Check for matched transactions (EXISTS stops at the first row; only
+    # count them when reporting the error)
+    has_matched = not delete_matched and db.scalar(
+        select(select(Transaction.id).where(
+            Transaction.pdf_id == pdf_id,
+            Transaction.is_matched == True
+        ).exists())
+    )
 
-    if matched_count > 0 and not delete_matched:
+    if has_matched:
+        matched_count = db.query(Transaction).filter(
+            Transaction.pdf_id == pdf_id,
+            Transaction.is_matched == True
+        ).count()
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail={
@@ -300,22 +430,23 @@ async def force_reextract_transactions(
             }
         )
 
-    # Delete existing transactions
+    # Delete existing transactions (committed together with the new ones,
+    # so a failed extraction leaves the old transactions in place)
     query = db.query(Transaction).filter(Transaction.pdf_id == pdf_id)
     if not delete_matched:
         query = query.filter(Transaction.is_matched == False)
 
     deleted_count = query.delete()
-    db.commit()
 
-    logger.info(f"Force re-extract: Deleted {deleted_count} transactions for PDF {pdf_id}")
+    logger.info(f"Force re-extract: Deleting {deleted_count} transactions for PDF {pdf_id}")
 
-    # Call normal extraction
-    return await extract_pdf_transactions(pdf_id, db)
+    # Nothing is left to trip the "already extracted" guard, so skip
+    # straight to extraction
+    return _extract_and_persist(pdf_record, db)
 
 
 @router.get("/status/{pdf_id}")
-async def get_extraction_status(
+def get_extraction_status(
     pdf_id: str,
     db: Session = Depends(get_db)
 ):
@@ -323,20 +454,20 @@ async def get_extraction_status(
     Get extraction status for a PDF.
 
     Returns information about whether the PDF has been extracted,
-    how many transactions exist, and if it's a duplicate.
+    how many transactions exist, if it's a duplicate, and the state of
+    the latest background extraction job (None if never queued).
     """
     pdf_record = db.query(PDF).filter(PDF.id == pdf_id).first()
     if not pdf_record:
         raise HTTPException(status_code=404, detail="PDF not found")
 
-    transaction_count = db.query(Transaction).filter(
+    # Total and matched counts in one scan
+    transaction_count, matched_count = db.query(
+        func.count(Transaction.id),
+        func.count(Transaction.id).filter(Transaction.is_matched == True)
+    ).filter(
         Transaction.pdf_id == pdf_id
-    ).count()
-
-    matched_count = db.query(Transaction).filter(
-        Transaction.pdf_id == pdf_id,
-        Transaction.is_matched == True
-    ).count()
+    ).one()
 
     # Check if this PDF is a duplicate of another
     duplicate_pdfs = db.query(PDF).filter(
@@ -344,6 +475,8 @@ async def get_extraction_status(
         PDF.id != pdf_id
     ).all()
 
+    extraction_job = job_service.find_latest_job("extraction", pdf_id=pdf_id)
+
     return {
         "pdf_id": pdf_id,
         "filename": pdf_record.filename,
@@ -360,5 +493,6 @@ async def get_extraction_status(
                 "uploaded_at": dup.uploaded_at.isoformat()
             }
             for dup in duplicate_pdfs
-        ] if duplicate_pdfs else []
+        ] if duplicate_pdfs else [],
+        "extraction_job": extraction_job.to_dict() if extraction_job else None
     }
@@ -1,15 +1,52 @@
 from fastapi import APIRouter, status
 from sqlalchemy import text
-from models.base import SessionLocal
+from models.base import engine
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+import asyncio
 import os
+import time
 
 router = APIRouter(prefix="/api", tags=["health"])
 
+# Orchestrators, load balancers and monitoring all poll /health; within this
+# window they share one result instead of each hitting the DB and filesystem
+HEALTH_CACHE_TTL_SECONDS = float(os.getenv("HEALTH_CACHE_TTL_SECONDS", "2"))
+
+# (expires_at monotonic time, health status)
+_health_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+def _check_database() -> str:
+    """Run SELECT 1 on a pooled connection and return the check result."""
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return "connected"
+    except Exception as e:
+        return f"error: {str(e)}"
+
+
+def _check_directories(required_dirs: Dict[str, Path]) -> Dict[str, str]:
+    """Check each directory exists and is writable, keyed by check name."""
+    results = {}
+
+    for name, path in required_dirs.items():
+        if path.exists() and path.is_dir():
+            # Check if writable (without creating a probe file)
+            if os.access(path, os.W_OK | os.X_OK):
+                results[f"dir_{name}"] = "ok"
+            else:
+                results[f"dir_{name}"] = "not_writable"
+        else:
+            results[f"dir_{name}"] = "missing"
+
+    return results
+
 
 @router.get("/health", status_code=status.HTTP_200_OK)
-def health_check():
+async def health_check():
     """
     Health check endpoint for container orchestration and monitoring.
 
@@ -18,46 +55,41 @@ def health_check():
     - Database connection works
     - Required directories exist and are writable
 
+    The blocking checks run in worker threads so probes never stall the
+    event loop, and results are cached for HEALTH_CACHE_TTL_SECONDS.
+
     Returns:
         Status message with component health checks
     """
-    health_status = {
-        "status": "healthy",
-        "version": "1.0.0",
-        "timestamp": datetime.utcnow().isoformat(),
-        "checks": {}
-    }
+    global _health_cache
 
-    # Test database connection
-    try:
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        db.close()
-        health_status["checks"]["database"] = "connected"
-    except Exception as e:
-        health_status["status"] = "unhealthy"
-        health_status["checks"]["database"] = f"error: {str(e)}"
+    now = time.monotonic()
+    if _health_cache is not None and _health_cache[0] > now:
+        return _health_cache[1]
 
-    # Check required directories exist and are writable
     required_dirs = {
         "dir_data": Path(os.getenv("DATA_DIR", "data")),
         "dir_uploads": Path(os.getenv("UPLOAD_DIR", "uploads")),
         "dir_exports": Path(os.getenv("EXPORT_DIR", "exports"))
     }
 
-    for name, path in required_dirs.items():
-        if path.exists() and path.is_dir():
-            # Check if writable
-            test_file = path / ".health_check"
-            try:
-                test_file.touch()
-                test_file.unlink()
-                health_status["checks"][f"dir_{name}"] = "ok"
-            except Exception:
-                health_status["status"] = "unhealthy"
-                health_status["checks"][f"dir_{name}"] = "not_writable"
-        else:
-            health_status["status"] = "unhealthy"
-            health_status["checks"][f"dir_{name}"] = "missing"
+    database_check, directory_checks = await asyncio.gather(
+        asyncio.to_thread(_check_database),
+        asyncio.to_thread(_check_directories, required_dirs)
+    )
+
+    health_status = {
+        "status": "healthy",
+        "version": "1.0.0",
+        "timestamp": datetime.utcnow().isoformat(),
+        "checks": {"database": database_check, **directory_checks}
+    }
+
+    if database_check != "connected" or any(
+        result != "ok" for result in directory_checks.values()
+    ):
+        health_status["status"] = "unhealthy"
+
+    _health_cache = (now + HEALTH_CACHE_TTL_SECONDS, health_status)
 
     return health_status
@@ -0,0 +1,72 @@
+"""
+API routes for polling background job status.
+"""
+from fastapi import APIRouter, HTTPException, Response, status
+from fastapi.encoders import jsonable_encoder
+from typing import Any, Callable
+import logging
+import orjson
+
+from models.base import SessionLocal
+from services.job_service import job_service
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+def run_job(job_id: str, handler: Callable[..., Any], *args):
+    """
+    Execute a route handler as a background job with its own DB session.
+
+    The request-scoped session is closed once the 202 response is sent, so
+    the job opens a fresh one. HTTPException details are recorded as the job
+    error so clients see the same payload the synchronous endpoint returns.
+
+    Args:
+        job_id: ID of a job created via job_service.create_job
+        handler: Route handler accepting (*args, db=Session)
+        *args: Positional arguments for the handler
+    """
+    job_service.mark_running(job_id)
+    db = SessionLocal()
+    try:
+        result = handler(*args, db=db)
+        if isinstance(result, Response):
+            # Handlers that pre-render JSON (e.g. ORJSONResponse) return the body
+            result = orjson.loads(result.body)
+        job_service.mark_completed(job_id, jsonable_encoder(result))
+    except HTTPException as e:
+        job_service.mark_failed(job_id, e.detail)
+    except Exception as e:
+        logger.error(f"Background job {job_id} failed: {str(e)}", exc_info=True)
+        job_service.mark_failed(job_id, {
+            "error": "server_error",
+            "message": "An unexpected error occurred while running the job.",
+            "details": str(e)
+        })
+    finally:
+        db.close()
+
+
+@router.get("/{job_id}")
+def get_job_status(job_id: str):
+    """
+    Get the state of a background job.
+
+    Returns:
+        Job state ('queued', 'running', 'completed', 'failed') with the
+        result once completed or the error detail once failed
+
+    Raises:
+        HTTPException: If job not found (404)
+    """
+    job = job_service.get_job(job_id)
+
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Job with id {job_id} not found"
+        )
+
+    return job.to_dict()
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import func, insert
+from sqlalchemy.orm import Session, joinedload, selectinload
 from typing import Optional
 
 from models.base import get_db
@@ -9,9 +11,26 @@ from services.matching_service import matching_service
 
 router = APIRouter(prefix="/api/match", tags=["matching"])
 
+# Load both sides of a match in the same query (responses always include them)
+MATCH_TRANSACTION_LOAD_OPTIONS = (
+    joinedload(Match.car_transaction),
+    joinedload(Match.receipt_transaction),
+)
+
+
+def _matching_fields(transaction: Transaction) -> dict:
+    """Fields used by matching_service scoring (date stays a date object)."""
+    return {
+        'transaction_id': transaction.id,
+        'date': transaction.date,
+        'amount': transaction.amount,
+        'employee_id': transaction.employee_id,
+        'merchant': transaction.merchant
+    }
+
 
 @router.post("/run", response_model=MatchListResponse)
-async def run_matching(
+def run_matching(
     min_confidence: Optional[float] = Query(0.70, ge=0.0, le=1.0),
     db: Session = Depends(get_db)
 ):
@@ -55,9 +74,10 @@ async def run_matching(
             }
         )
 
-    # Convert to dictionaries
-    car_dicts = [t.to_dict() for t in car_transactions]
-    receipt_dicts = [t.to_dict() for t in receipt_transactions]
+    # Convert to dictionaries holding only the scored fields (they are
+    # pickled to the matching workers)
+    car_dicts = [_matching_fields(t) for t in car_transactions]
+    receipt_dicts = [_matching_fields(t) for t in receipt_transactions]
 
     # Run matching algorithm
     try:
@@ -67,61 +87,52 @@ async def run_matching(
             min_confidence
         )
 
-        # Save matches to database
-        match_records = []
-        for match in matches:
-            match_record = Match(
-                car_transaction_id=match.car_transaction_id,
-                receipt_transaction_id=match.receipt_transaction_id,
-                confidence_score=match.confidence_score,
-                date_score=match.date_score,
-                amount_score=match.amount_score,
-                employee_score=match.employee_score,
-                merchant_score=match.merchant_score,
-                status='pending'
-            )
-            db.add(match_record)
-            match_records.append(match_record)
-
-        # Mark transactions as matched
-        matched_car_ids = [m.car_transaction_id for m in matches]
-        matched_receipt_ids = [m.receipt_transaction_id for m in matches]
+        # Mark both sides of every match as matched in one UPDATE
+        matched_ids = [m.car_transaction_id for m in matches] + [m.receipt_transaction_id for m in matches]
 
         db.query(Transaction).filter(
-            Transaction.id.in_(matched_car_ids)
+            Transaction.id.in_(matched_ids)
         ).update({Transaction.is_matched: True}, synchronize_session=False)
 
-        db.query(Transaction).filter(
-            Transaction.id.in_(matched_receipt_ids)
-        ).update({Transaction.is_matched: True}, synchronize_session=False)
+        # Insert matches in one statement; RETURNING yields IDs and server
+        # timestamps, and the eager loads pick up the just-updated transactions
+        match_records = []
+        if matches:
+            match_records = db.scalars(
+                insert(Match).returning(Match, sort_by_parameter_order=True).options(
+                    selectinload(Match.car_transaction),
+                    selectinload(Match.receipt_transaction)
+                ).execution_options(populate_existing=True),
+                [
+                    {
+                        'car_transaction_id': match.car_transaction_id,
+                        'receipt_transaction_id': match.receipt_transaction_id,
+                        'confidence_score': match.confidence_score,
+                        'date_score': match.date_score,
+                        'amount_score': match.amount_score,
+                        'employee_score': match.employee_score,
+                        'merchant_score': match.merchant_score,
+                        'status': 'pending'
+                    }
+                    for match in matches
+                ]
+            ).all()
+
+        # Serialize with full transaction details before commit expires
+        # the loaded attributes
+        match_responses = [m.to_response_dict() for m in match_records]
 
         db.commit()
 
-        # Refresh to get IDs and relationships
-        for match_record in match_records:
-            db.refresh(match_record)
-
-        # Get counts
-        pending_count = len([m for m in match_records if m.status == 'pending'])
-        approved_count = len([m for m in match_records if m.status == 'approved'])
-        exported_count = len([m for m in match_records if m.exported])
-
-        # Build response with full transaction details
-        matches_with_transactions = []
-        for match_record in match_records:
-            matches_with_transactions.append({
-                **match_record.to_dict(),
-                'car_transaction': match_record.car_transaction.to_dict(),
-                'receipt_transaction': match_record.receipt_transaction.to_dict()
-            })
-
-        return MatchListResponse(
-            matches=[MatchWithTransactionsResponse.model_validate(m) for m in matches_with_transactions],
-            total_count=len(match_records),
-            pending_count=pending_count,
-            approved_count=approved_count,
-            exported_count=exported_count
-        )
+        # Trusted DB rows: skip response_model validation and encode directly.
+        # Newly created matches are always pending and not yet exported
+        return ORJSONResponse({
+            "matches": match_responses,
+            "total_count": len(match_records),
+            "pending_count": len(match_records),
+            "approved_count": 0,
+            "exported_count": 0
+        })
 
     except Exception as e:
         db.rollback()
@@ -136,7 +147,7 @@ async def run_matching(
 
 
 @router.get("/matches", response_model=MatchListResponse)
-async def get_all_matches(
+def get_all_matches(
     status_filter: Optional[str] = Query(None, regex="^(pending|approved|rejected|exported)$"),
     exported_only: bool = False,
     db: Session = Depends(get_db)
@@ -159,33 +170,43 @@ async def get_all_matches(
     if exported_only:
         query = query.filter(Match.exported == True)
 
-    matches = query.order_by(Match.confidence_score.desc()).all()
-
-    # Get counts
-    pending_count = len([m for m in matches if m.status == 'pending'])
-    approved_count = len([m for m in matches if m.status == 'approved'])
-    exported_count = len([m for m in matches if m.exported])
+    # Calculate counts in SQL (one row per status/exported combination)
+    count_rows = query.with_entities(
+        Match.status,
+        Match.exported,
+        func.count(Match.id)
+    ).group_by(
+        Match.status,
+        Match.exported
+    ).all()
 
-    # Build response with full transaction details
-    matches_with_transactions = []
-    for match_record in matches:
-        matches_with_transactions.append({
-            **match_record.to_dict(),
-            'car_transaction': match_record.car_transaction.to_dict(),
-            'receipt_transaction': match_record.receipt_transaction.to_dict()
-        })
+    pending_count = 0
+    approved_count = 0
+    exported_count = 0
+    for row_status, row_exported, row_count in count_rows:
+        if row_status == 'pending':
+            pending_count += row_count
+        elif row_status == 'approved':
+            approved_count += row_count
+        if row_exported:
+            exported_count += row_count
+
+    matches = query.options(*MATCH_TRANSACTION_LOAD_OPTIONS).order_by(
+        Match.confidence_score.desc()
+    ).all()
 
-    return MatchListResponse(
-        matches=[MatchWithTransactionsResponse.model_validate(m) for m in matches_with_transactions],
-        total_count=len(matches),
-        pending_count=pending_count,
-        approved_count=approved_count,
-        exported_count=exported_count
-    )
+    # Trusted DB rows: skip response_model validation and encode directly
+    return ORJSONResponse({
+        "matches": [m.to_response_dict() for m in matches],
+        "total_count": len(matches),
+        "pending_count": pending_count,
+        "approved_count": approved_count,
+        "exported_count": exported_count
+    })
 
 
 @router.get("/matches/{match_id}", response_model=MatchWithTransactionsResponse)
-async def get_match(
+def get_match(
     match_id: str,
     db: Session = Depends(get_db)
 ):
@@ -201,7 +222,9 @@ async def get_match(
     Raises:
         HTTPException: If match not found (404)
     """
-    match = db.query(Match).filter(Match.id == match_id).first()
+    match = db.query(Match).options(*MATCH_TRANSACTION_LOAD_OPTIONS).filter(
+        Match.id == match_id
+    ).first()
 
     if not match:
         raise HTTPException(
@@ -209,17 +232,11 @@ async def get_match(
             detail=f"Match with id {match_id} not found"
         )
 
-    match_data = {
-        **match.to_dict(),
-        'car_transaction': match.car_transaction.to_dict(),
-        'receipt_transaction': match.receipt_transaction.to_dict()
-    }
-
-    return MatchWithTransactionsResponse.model_validate(match_data)
+    return ORJSONResponse(match.to_response_dict())
 
 
 @router.patch("/matches/{match_id}", response_model=MatchWithTransactionsResponse)
-async def update_match(
+def update_match(
     match_id: str,
     update_data: MatchUpdate,
     db: Session = Depends(get_db)
@@ -256,19 +273,17 @@ async def update_match(
         match.review_notes = update_data.review_notes
 
     db.commit()
-    db.refresh(match)
 
-    match_data = {
-        **match.to_dict(),
-        'car_transaction': match.car_transaction.to_dict(),
-        'receipt_transaction': match.receipt_transaction.to_dict()
-    }
+    # Reload the match (expired by commit) together with its transactions
+    match = db.query(Match).options(*MATCH_TRANSACTION_LOAD_OPTIONS).filter(
+        Match.id == match_id
+    ).one()
 
-    return MatchWithTransactionsResponse.model_validate(match_data)
+    return ORJSONResponse(match.to_response_dict())
 
 
 @router.delete("/matches/{match_id}")
-async def delete_match(
+def delete_match(
     match_id: str,
     db: Session = Depends(get_db)
 ):
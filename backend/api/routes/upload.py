@@ -10,18 +10,23 @@ Features:
 - Early validation before DB operations
 """
 
-from fastapi import APIRouter, File, UploadFile, Depends, HTTPException, status, Request
+from fastapi import APIRouter, BackgroundTasks, File, UploadFile, Depends, HTTPException, status, Request
+from fastapi.responses import ORJSONResponse
+from starlette.datastructures import Headers
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import SQLAlchemyError, IntegrityError, OperationalError
-from typing import Literal, Dict, Any, Optional, List
+from sqlalchemy.exc import SQLAlchemyError, OperationalError
+from typing import Literal, Dict, Any, Optional, List, Mapping
+import asyncio
 import logging
+import os
+import re
 import traceback
 import uuid
+import weakref
 from datetime import datetime
+from types import MappingProxyType
 
-from models.base import get_db
-from models.pdf import PDF
-from models.transaction import Transaction
+from models.base import SessionLocal, get_db
 from schemas.pdf import PDFUploadResponse, PDFValidationError
 from services.pdf_service import pdf_service, PDFValidationError as ServicePDFValidationError
 from services.deduplication_service import deduplication_service
@@ -34,51 +39,25 @@ logger = logging.getLogger(__name__)
 # Error Response Helpers
 # ============================================================================
 
-def create_error_response(
-    error_type: str,
-    user_message: str,
-    status_code: int,
-    context: Optional[Dict[str, Any]] = None,
-    actions: Optional[List[Dict[str, Any]]] = None,
-    developer_detail: Optional[str] = None,
-    correlation_id: Optional[str] = None
-) -> Dict[str, Any]:
+def get_request_timestamp(request: Request) -> str:
     """
-    Create a consistent, structured error response.
+    Get the ISO 8601 error timestamp for a request, formatting it only once.
+
+    The first call stores the timestamp on request.state so the error
+    response and its log entry share one value instead of each calling
+    datetime.utcnow().isoformat().
 
     Args:
-        error_type: Machine-readable error type (e.g., 'duplicate_pdf', 'validation_error')
-        user_message: Human-friendly message for end users
-        status_code: HTTP status code
-        context: Additional context about the error (e.g., duplicate PDF details)
-        actions: List of actionable next steps for the client
-        developer_detail: Technical details for debugging (not shown to end users)
-        correlation_id: Request correlation ID for tracing
+        request: Incoming request
 
     Returns:
-        Structured error response dictionary
+        UTC timestamp in ISO 8601 format
     """
-    response = {
-        "error": error_type,
-        "message": user_message,
-        "status_code": status_code,
-        "timestamp": datetime.utcnow().isoformat(),
-    }
-
-    if correlation_id:
-        response["correlation_id"] = correlation_id
-
-    if context:
-        response["context"] = context
-
-    if actions:
-        response["actions"] = actions
-
-    # Only include developer details in development/debug mode
-    if developer_detail:
-        response["developer_detail"] = developer_detail
-
-    return response
+    now_iso = getattr(request.state, "now_iso", None)
+    if now_iso is None:
+        now_iso = datetime.utcnow().isoformat()
+        request.state.now_iso = now_iso
+    return now_iso
 
 
 def log_error_with_context(
@@ -90,7 +69,8 @@ def log_error_with_context(
     file_hash: Optional[str] = None,
     pdf_type: Optional[str] = None,
     exception: Optional[Exception] = None,
-    include_traceback: bool = False
+    include_traceback: bool = False,
+    now_iso: Optional[str] = None
 ):
     """
     Log error with structured context for observability.
@@ -101,15 +81,17 @@ def log_error_with_context(
         message: Error message
         correlation_id: Request correlation ID
         filename: Upload filename
-        file_hash: File SHA-256 hash
+        file_hash: File BLAKE3 hash
         pdf_type: PDF type (car/receipt)
         exception: Exception object if available
         include_traceback: Whether to include full traceback
+        now_iso: Cached request timestamp (see get_request_timestamp);
+            defaults to the current time
     """
     log_context = {
         "error_type": error_type,
         "correlation_id": correlation_id,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": now_iso or datetime.utcnow().isoformat(),
     }
 
     if filename:
@@ -132,434 +114,407 @@ def log_error_with_context(
 # Early Validation Helpers
 # ============================================================================
 
-def validate_upload_file(file: UploadFile, pdf_type: str) -> Optional[Dict[str, Any]]:
-    """
-    Perform early validation before processing the file.
-
-    Returns:
-        Error response dict if validation fails, None if validation passes
-    """
-    # Check filename exists
-    if not file.filename:
-        return create_error_response(
-            error_type="missing_filename",
-            user_message="Upload failed: filename is required.",
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            developer_detail="UploadFile.filename is None or empty"
-        )
-
-    # Check file extension
-    if not file.filename.lower().endswith('.pdf'):
-        return create_error_response(
-            error_type="invalid_file_type",
-            user_message=f"Upload failed: '{file.filename}' is not a PDF file. Only .pdf files are accepted.",
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            context={"filename": file.filename, "expected_extension": ".pdf"},
-            actions=[
-                {
-                    "action": "convert_to_pdf",
-                    "description": "Convert your file to PDF format and try again"
-                }
-            ]
-        )
+_PDF_EXTENSIONS: frozenset = frozenset((".pdf",))
+_PDF_CONTENT_TYPES: frozenset = frozenset(("application/pdf", "application/pdf; charset=binary"))
+
+# Reject uploads without a PDF header before they are saved and parsed
+_CHECK_PDF_SIGNATURE = os.getenv("UPLOAD_CHECK_PDF_SIGNATURE", "true").lower() != "false"
+_PDF_SIGNATURE = b"%PDF-"
+_PDF_SIGNATURE_SEARCH_BYTES = 1024  # Readers accept the header anywhere in the first 1KB
+
+# Static parts of the validation error responses, built once at import.
+# Each rejection copies its template and fills in the per-request fields.
+_ERR_MISSING_FILENAME = MappingProxyType({
+    "error": "missing_filename",
+    "message": "Upload failed: filename is required.",
+    "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
+    "developer_detail": "UploadFile.filename is None or empty"
+})
+
+_ERR_INVALID_FILE_TYPE = MappingProxyType({
+    "error": "invalid_file_type",
+    "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
+    "actions": [
+        {
+            "action": "convert_to_pdf",
+            "description": "Convert your file to PDF format and try again"
+        }
+    ]
+})
+
+_ERR_MISSING_PDF_SIGNATURE = MappingProxyType({
+    "error": "invalid_file_type",
+    "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
+    "actions": [
+        {
+            "action": "verify_pdf",
+            "description": "Make sure the file is a real PDF, not another format renamed to .pdf"
+        }
+    ],
+    "developer_detail": "No %PDF- header in the first 1024 bytes"
+})
+
+_ERR_FILE_TOO_LARGE = MappingProxyType({
+    "error": "file_too_large",
+    "status_code": status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+    "actions": [
+        {
+            "action": "split_pdf",
+            "description": "Split the PDF into smaller files and upload them separately"
+        }
+    ]
+})
+
+# Templates for errors raised after the upload was received
+_ERR_PDF_VALIDATION_FAILED = MappingProxyType({
+    "error": "pdf_validation_failed",
+    "status_code": status.HTTP_422_UNPROCESSABLE_ENTITY,
+    "actions": [
+        {
+            "action": "verify_pdf",
+            "description": "Ensure the PDF is not corrupted or password-protected"
+        },
+        {
+            "action": "check_requirements",
+            "description": "Verify PDF meets requirements (max 300MB, 1-1500 pages, contains text)"
+        }
+    ]
+})
+
+_ERR_DUPLICATE_DETECTED = MappingProxyType({
+    "error": "duplicate_detected",
+    "message": "This PDF has already been uploaded (detected during save).",
+    "status_code": status.HTTP_409_CONFLICT,
+    "actions": [
+        {
+            "action": "refresh_list",
+            "description": "Refresh your PDF list to see the existing upload"
+        }
+    ],
+    "developer_detail": "Conflicting PDF record no longer exists"
+})
+
+_ERR_DATABASE_UNAVAILABLE = MappingProxyType({
+    "error": "database_unavailable",
+    "message": "Upload failed: Database is temporarily unavailable. Please try again in a moment.",
+    "status_code": status.HTTP_503_SERVICE_UNAVAILABLE,
+    "actions": [
+        {
+            "action": "retry",
+            "description": "Retry the upload in a few seconds"
+        }
+    ]
+})
+
+_ERR_DATABASE_ERROR = MappingProxyType({
+    "error": "database_error",
+    "message": "Upload failed: Unable to save PDF metadata to database.",
+    "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR
+})
+
+_ERR_UNEXPECTED = MappingProxyType({
+    "error": "unexpected_error",
+    "message": "An unexpected error occurred during upload. The file was not saved.",
+    "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR
+})
+
+_RETRY_ACTION = {
+    "action": "retry",
+    "description": "Try uploading again"
+}
+
+
+def _has_pdf_signature(fileobj) -> bool:
+    """Check the upload's leading bytes for the PDF header, then rewind."""
+    head = fileobj.read(_PDF_SIGNATURE_SEARCH_BYTES)
+    fileobj.seek(0)
+    return _PDF_SIGNATURE in head
+
+
+def _rejection_detail(
+    template: Mapping[str, Any],
+    correlation_id: str,
+    now_iso: Optional[str] = None,
+    **fields
+) -> Dict[str, Any]:
+    """Build the error response for an error template."""
+    return {
+        **template,
+        **fields,
+        "timestamp": now_iso or datetime.utcnow().isoformat(),
+        "correlation_id": correlation_id
+    }
 
-    # Validate PDF type
-    if pdf_type not in ["car", "receipt"]:
-        return create_error_response(
-            error_type="invalid_pdf_type",
-            user_message=f"Upload failed: '{pdf_type}' is not a valid PDF type.",
-            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-            context={"provided_type": pdf_type, "valid_types": ["car", "receipt"]},
-            developer_detail="pdf_type must be 'car' or 'receipt'"
-        )
 
-    # Check content type if provided
-    if file.content_type and not file.content_type.startswith('application/pdf'):
-        logger.warning(f"Unexpected content type: {file.content_type} for file {file.filename}")
+def _reject_upload(
+    template: Mapping[str, Any],
+    correlation_id: str,
+    now_iso: Optional[str] = None,
+    **fields
+):
+    """Raise the HTTPException for an error template."""
+    raise HTTPException(
+        status_code=template["status_code"],
+        detail=_rejection_detail(template, correlation_id, now_iso, **fields)
+    )
+
+
+def _retry_or_contact_support_actions(correlation_id: str) -> List[Dict[str, Any]]:
+    """Actions of the 500 errors: retry, then contact support quoting the correlation ID."""
+    return [
+        _RETRY_ACTION,
+        {
+            "action": "contact_support",
+            "description": f"If problem persists, contact support with correlation ID: {correlation_id}"
+        }
+    ]
+
+
+def _invalid_file_type_fields(filename: str) -> Dict[str, Any]:
+    """Per-request fields of the invalid_file_type (extension) error."""
+    return {
+        "message": f"Upload failed: '{filename}' is not a PDF file. Only .pdf files are accepted.",
+        "context": {"filename": filename, "expected_extension": ".pdf"}
+    }
 
-    return None  # Validation passed
 
+def _missing_signature_fields(filename: str) -> Dict[str, Any]:
+    """Per-request fields of the missing PDF header error."""
+    return {
+        "message": f"Upload failed: '{filename}' is not a valid PDF file.",
+        "context": {"filename": filename}
+    }
 
-# ============================================================================
-# Upload Handlers
-# ============================================================================
 
-@router.post("/car", response_model=PDFUploadResponse, status_code=status.HTTP_201_CREATED)
-async def upload_car_pdf(
-    request: Request,
-    file: UploadFile = File(..., description="CAR PDF file"),
-    db: Session = Depends(get_db)
-):
+def validate_upload_file(
+    file: UploadFile,
+    pdf_type: Literal["car", "receipt"],
+    correlation_id: str,
+    max_bytes: int = pdf_service.MAX_FILE_SIZE_MB * 1024 * 1024
+) -> None:
     """
-    Upload Corporate American Express Report (CAR) PDF.
-
-    Features:
-    - Early validation of file type and format
-    - Duplicate detection via SHA-256 hash (idempotent - returns existing PDF)
-    - Structured error responses with actionable next steps
-    - Request correlation for distributed tracing
-    - Comprehensive logging with context
+    Perform early validation before processing the file.
 
-    Returns:
-        PDFUploadResponse: Metadata about uploaded PDF (new or existing)
+    Args:
+        file: Uploaded file
+        pdf_type: PDF type (car/receipt), fixed by the upload route
+        correlation_id: Request correlation ID included in error responses
+        max_bytes: Maximum accepted upload size
 
     Raises:
-        HTTPException 422: Validation failed (invalid file type, format)
-        HTTPException 400: Bad request (corrupted file, unreadable)
-        HTTPException 500: Server error (DB failure, unexpected error)
+        HTTPException 422: Missing filename, non-PDF extension or content
+        HTTPException 413: File too large
     """
-    # Generate correlation ID for request tracing
-    correlation_id = str(uuid.uuid4())
-
-    # Initialize variables for cleanup
-    file_path = None
-    filename = None
-    file_hash = None
-
-    try:
-        # ====================
-        # 1. EARLY VALIDATION (before any processing)
-        # ====================
-        validation_error = validate_upload_file(file, pdf_type="car")
-        if validation_error:
-            validation_error["correlation_id"] = correlation_id
-            raise HTTPException(
-                status_code=validation_error["status_code"],
-                detail=validation_error
-            )
-
-        logger.info(
-            f"[{correlation_id}] CAR upload started | filename={file.filename}"
+    # Check filename exists
+    if not file.filename:
+        _reject_upload(_ERR_MISSING_FILENAME, correlation_id)
+
+    # Check file extension (lowercase only the suffix, not the whole name)
+    if os.path.splitext(file.filename)[1].lower() not in _PDF_EXTENSIONS:
+        _reject_upload(_ERR_INVALID_FILE_TYPE, correlation_id, **_invalid_file_type_fields(file.filename))
+
+    # Check size from the spooled upload before copying or hashing it
+    if file.size is not None and file.size > max_bytes:
+        _reject_upload(
+            _ERR_FILE_TOO_LARGE,
+            correlation_id,
+            message=(
+                f"Upload failed: file size ({file.size / 1024 / 1024:.1f} MB) exceeds "
+                f"maximum {max_bytes / 1024 / 1024:.0f} MB."
+            ),
+            context={"filename": file.filename, "file_size_bytes": file.size, "max_bytes": max_bytes}
         )
 
-        # ====================
-        # 2. SAVE & VALIDATE FILE (with hash calculation)
-        # ====================
-        try:
-            file_path, filename, page_count, file_size, file_hash = await pdf_service.save_uploaded_file(
-                file, pdf_type="car"
-            )
+    # Check the PDF header (cheap) before any expensive parsing
+    if _CHECK_PDF_SIGNATURE and not _has_pdf_signature(file.file):
+        _reject_upload(_ERR_MISSING_PDF_SIGNATURE, correlation_id, **_missing_signature_fields(file.filename))
 
-            logger.info(
-                f"[{correlation_id}] File validated | "
-                f"filename={filename} pages={page_count} size={file_size}bytes hash={file_hash[:16]}..."
-            )
+    # Check content type if provided (exact match covers almost every client)
+    content_type = file.content_type
+    if (
+        content_type
+        and content_type not in _PDF_CONTENT_TYPES
+        and not content_type.startswith('application/pdf')
+    ):
+        logger.warning("Unexpected content type: %s for file %s", content_type, file.filename)
 
-        except ServicePDFValidationError as e:
-            # Validation error - return 422 Unprocessable Entity
-            log_error_with_context(
-                logger,
-                error_type="pdf_validation_failed",
-                message="PDF validation failed",
-                correlation_id=correlation_id,
-                filename=file.filename,
-                pdf_type="car",
-                exception=e
-            )
-
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=create_error_response(
-                    error_type="pdf_validation_failed",
-                    user_message=f"Upload failed: {str(e)}",
-                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                    context={"filename": file.filename},
-                    actions=[
-                        {
-                            "action": "verify_pdf",
-                            "description": "Ensure the PDF is not corrupted or password-protected"
-                        },
-                        {
-                            "action": "check_requirements",
-                            "description": "Verify PDF meets requirements (max 300MB, 1-1500 pages, contains text)"
-                        }
-                    ],
-                    correlation_id=correlation_id,
-                    developer_detail=str(e)
-                )
-            )
 
-        # ====================
-        # 3. DUPLICATE DETECTION
-        # ====================
-        try:
-            duplicate_pdf = deduplication_service.check_duplicate_pdf(file_hash, db)
-
-            if duplicate_pdf:
-                # Delete newly saved file (it's a duplicate)
-                pdf_service.delete_file(file_path)
-
-                # Count existing transactions
-                try:
-                    transaction_count = db.query(Transaction).filter(
-                        Transaction.pdf_id == duplicate_pdf.id
-                    ).count()
-                except SQLAlchemyError as count_error:
-                    logger.warning(
-                        f"[{correlation_id}] Failed to count transactions for duplicate: {count_error}"
-                    )
-                    transaction_count = 0  # Graceful degradation
-
-                # Clear any existing matches for this PDF's transactions
-                matches_cleared = 0
-                try:
-                    from models.transaction import Match
-
-                    # Get all transaction IDs for this PDF
-                    transaction_ids = db.query(Transaction.id).filter(
-                        Transaction.pdf_id == duplicate_pdf.id
-                    ).all()
-                    transaction_ids = [t[0] for t in transaction_ids]
-
-                    # Delete matches where either CAR or receipt is from this PDF
-                    if transaction_ids:
-                        matches_to_delete = db.query(Match).filter(
-                            (Match.car_transaction_id.in_(transaction_ids)) |
-                            (Match.receipt_transaction_id.in_(transaction_ids))
-                        )
-                        matches_cleared = matches_to_delete.count()
-                        matches_to_delete.delete(synchronize_session=False)
-
-                        # Reset is_matched flag for all transactions
-                        db.query(Transaction).filter(
-                            Transaction.id.in_(transaction_ids)
-                        ).update({"is_matched": False}, synchronize_session=False)
-
-                        db.commit()
-
-                        logger.info(
-                            f"[{correlation_id}] Cleared {matches_cleared} matches for duplicate PDF"
-                        )
-                except Exception as match_error:
-                    logger.warning(
-                        f"[{correlation_id}] Failed to clear matches: {match_error}"
-                    )
-                    db.rollback()
-                    matches_cleared = 0
-
-                logger.info(
-                    f"[{correlation_id}] Duplicate PDF detected, returning existing record | "
-                    f"original_id={duplicate_pdf.id} original_filename={duplicate_pdf.filename} "
-                    f"transactions={transaction_count} matches_cleared={matches_cleared}"
-                )
+# ============================================================================
+# Streaming Pre-check
+# ============================================================================
 
-                # Return existing PDF record with duplicate flag
-                return PDFUploadResponse(
-                    pdf_id=duplicate_pdf.id,
-                    filename=duplicate_pdf.filename,
-                    pdf_type=duplicate_pdf.pdf_type,
-                    page_count=duplicate_pdf.page_count,
-                    file_size_bytes=duplicate_pdf.file_size_bytes,
-                    uploaded_at=duplicate_pdf.uploaded_at,
-                    is_duplicate=True,
-                    transaction_count=transaction_count,
-                    matches_cleared=matches_cleared
-                )
+# Multipart framing (boundaries, part headers) on top of the file bytes
+_MULTIPART_OVERHEAD_BYTES = 16 * 1024
 
-        except OperationalError as db_error:
-            # Database connectivity issue during duplicate check
-            log_error_with_context(
-                logger,
-                error_type="database_connection_error",
-                message="Database connectivity issue during duplicate check",
-                correlation_id=correlation_id,
-                filename=filename,
-                file_hash=file_hash,
-                exception=db_error,
-                include_traceback=True
-            )
+_MULTIPART_BOUNDARY_RE = re.compile(rb'boundary="?([^";]+)"?', re.IGNORECASE)
+_PART_FILENAME_RE = re.compile(rb'filename="([^"]*)"', re.IGNORECASE)
 
-            # Cleanup uploaded file
-            if file_path:
-                pdf_service.delete_file(file_path)
-
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=create_error_response(
-                    error_type="database_unavailable",
-                    user_message="Upload failed: Database is temporarily unavailable. Please try again in a moment.",
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    actions=[
-                        {
-                            "action": "retry",
-                            "description": "Retry the upload in a few seconds"
-                        }
-                    ],
-                    correlation_id=correlation_id,
-                    developer_detail=f"OperationalError: {str(db_error)}"
-                )
-            )
 
-        # ====================
-        # 4. CREATE DATABASE RECORD
-        # ====================
-        try:
-            pdf_record = PDF(
-                filename=filename,
-                file_path=str(file_path.absolute()),
-                file_hash=file_hash,
-                pdf_type="car",
-                page_count=page_count,
-                file_size_bytes=file_size
-            )
-
-            db.add(pdf_record)
-            db.commit()
-            db.refresh(pdf_record)
-
-            logger.info(
-                f"[{correlation_id}] CAR PDF saved successfully | "
-                f"pdf_id={pdf_record.id} filename={filename}"
-            )
-
-            # Return success response
-            return PDFUploadResponse(
-                pdf_id=pdf_record.id,
-                filename=pdf_record.filename,
-                pdf_type=pdf_record.pdf_type,
-                page_count=pdf_record.page_count,
-                file_size_bytes=pdf_record.file_size_bytes,
-                uploaded_at=pdf_record.uploaded_at
-            )
+class UploadPrecheckMiddleware:
+    """
+    ASGI middleware that rejects invalid uploads before the body is received.
 
-        except IntegrityError as integrity_error:
-            # Race condition: duplicate was inserted between check and insert
-            db.rollback()
+    Runs the cheap upload checks while the multipart body is still arriving,
+    so rejected uploads are never spooled to a temp file:
+    - Content-Length over the size limit (413, before reading any body)
+    - Non-PDF filename extension in the first part's headers (422)
+    - Missing PDF header in the first part's leading bytes (422)
 
-            log_error_with_context(
-                logger,
-                error_type="integrity_error",
-                message="Database integrity error (possible race condition)",
-                correlation_id=correlation_id,
-                filename=filename,
-                file_hash=file_hash,
-                exception=integrity_error
-            )
+    Anything it cannot decide from the first body chunk is passed through;
+    validate_upload_file still runs every check in the handler.
+    """
 
-            # Cleanup uploaded file
-            if file_path:
-                pdf_service.delete_file(file_path)
-
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=create_error_response(
-                    error_type="duplicate_detected",
-                    user_message="This PDF has already been uploaded (detected during save).",
-                    status_code=status.HTTP_409_CONFLICT,
-                    actions=[
-                        {
-                            "action": "refresh_list",
-                            "description": "Refresh your PDF list to see the existing upload"
-                        }
-                    ],
-                    correlation_id=correlation_id,
-                    developer_detail=f"IntegrityError: {str(integrity_error)}"
-                )
-            )
+    def __init__(self, app, max_bytes: int = pdf_service.MAX_FILE_SIZE_MB * 1024 * 1024):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or not scope["path"].startswith(router.prefix + "/")
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        correlation_id = uuid.uuid4().hex
+
+        content_length = headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > self.max_bytes + _MULTIPART_OVERHEAD_BYTES:
+            await self._reject(scope, receive, send, _rejection_detail(
+                _ERR_FILE_TOO_LARGE,
+                correlation_id,
+                message=(
+                    f"Upload failed: file size ({int(content_length) / 1024 / 1024:.1f} MB) exceeds "
+                    f"maximum {self.max_bytes / 1024 / 1024:.0f} MB."
+                ),
+                context={"request_size_bytes": int(content_length), "max_bytes": self.max_bytes}
+            ))
+            return
+
+        boundary_match = _MULTIPART_BOUNDARY_RE.search(headers.get("content-type", "").encode("latin-1"))
+        if not boundary_match:
+            await self.app(scope, receive, send)
+            return
+
+        first_message = await receive()
+        detail = self._check_first_part(first_message.get("body", b""), boundary_match.group(1), correlation_id)
+        if detail:
+            logger.info(f"[{correlation_id}] Upload rejected before body received | error={detail['error']}")
+            await self._reject(scope, receive, send, detail)
+            return
+
+        # Hand the already-received chunk back to the app before the rest
+        replayed = False
+
+        async def replay_receive():
+            nonlocal replayed
+            if not replayed:
+                replayed = True
+                return first_message
+            return await receive()
+
+        await self.app(scope, replay_receive, send)
+
+    def _check_first_part(self, chunk: bytes, boundary: bytes, correlation_id: str) -> Optional[Dict[str, Any]]:
+        """Return an error response if the first multipart part is clearly not a PDF."""
+        headers_end = chunk.find(b"\r\n\r\n")
+        if headers_end == -1:
+            return None  # Part headers not fully received yet
+
+        filename_match = _PART_FILENAME_RE.search(chunk, 0, headers_end)
+        if not filename_match or not filename_match.group(1):
+            return None  # Not a file part (or no filename): leave it to the handler
+
+        filename = filename_match.group(1).decode("utf-8", errors="replace")
+        if os.path.splitext(filename)[1].lower() not in _PDF_EXTENSIONS:
+            return _rejection_detail(_ERR_INVALID_FILE_TYPE, correlation_id, **_invalid_file_type_fields(filename))
+
+        if _CHECK_PDF_SIGNATURE:
+            content = chunk[headers_end + 4:]
+            part_end = content.find(b"\r\n--" + boundary)
+            if part_end != -1:
+                content = content[:part_end]
+
+            # Only decide once the header window (or the whole part) is here
+            head = content[:_PDF_SIGNATURE_SEARCH_BYTES]
+            if (len(head) == _PDF_SIGNATURE_SEARCH_BYTES or part_end != -1) and _PDF_SIGNATURE not in head:
+                return _rejection_detail(_ERR_MISSING_PDF_SIGNATURE, correlation_id, **_missing_signature_fields(filename))
+
+        return None
+
+    async def _reject(self, scope, receive, send, detail: Dict[str, Any]):
+        """Send the error response in the same shape as HTTPException."""
+        response = ORJSONResponse(
+            {"detail": detail},
+            status_code=detail["status_code"],
+            headers={"Connection": "close"}
+        )
+        await response(scope, receive, send)
 
-        except SQLAlchemyError as db_error:
-            # Database error during commit
-            db.rollback()
 
-            log_error_with_context(
-                logger,
-                error_type="database_error",
-                message="Database error during PDF record creation",
-                correlation_id=correlation_id,
-                filename=filename,
-                file_hash=file_hash,
-                exception=db_error,
-                include_traceback=True
-            )
+# ============================================================================
+# Upload Handlers
+# ============================================================================
 
-            # Cleanup uploaded file
-            if file_path:
-                pdf_service.delete_file(file_path)
-
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=create_error_response(
-                    error_type="database_error",
-                    user_message="Upload failed: Unable to save PDF metadata to database.",
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    actions=[
-                        {
-                            "action": "retry",
-                            "description": "Try uploading again"
-                        },
-                        {
-                            "action": "contact_support",
-                            "description": f"If problem persists, contact support with correlation ID: {correlation_id}"
-                        }
-                    ],
-                    correlation_id=correlation_id,
-                    developer_detail=f"SQLAlchemyError: {str(db_error)}"
-                )
-            )
+def _reset_duplicate_pdf(pdf_id: str, correlation_id: str):
+    """
+    Clear matches of a re-uploaded PDF's transactions with its own DB session.
 
-    except HTTPException:
-        # Re-raise HTTP exceptions (already handled)
-        raise
+    Runs as a background task after the duplicate response is sent, when the
+    request-scoped session may already be closed.
 
-    except Exception as e:
-        # Unexpected error - catch-all handler
-        log_error_with_context(
-            logger,
-            error_type="unexpected_error",
-            message="Unexpected error during CAR upload",
-            correlation_id=correlation_id,
-            filename=filename,
-            file_hash=file_hash,
-            pdf_type="car",
-            exception=e,
-            include_traceback=True
+    Args:
+        pdf_id: ID of the existing PDF
+        correlation_id: Correlation ID of the upload request (for logging)
+    """
+    db = SessionLocal()
+    try:
+        _, matches_cleared = deduplication_service.reset_pdf_transactions(pdf_id, db)
+        logger.info(
+            f"[{correlation_id}] Cleared {matches_cleared} matches for duplicate PDF"
+        )
+    except SQLAlchemyError as reset_error:
+        db.rollback()
+        logger.warning(
+            f"[{correlation_id}] Failed to clear matches: {reset_error}"
         )
+    finally:
+        db.close()
 
-        # Cleanup uploaded file if it exists
-        if file_path:
-            try:
-                pdf_service.delete_file(file_path)
-            except Exception as cleanup_error:
-                logger.error(f"[{correlation_id}] Cleanup failed: {cleanup_error}")
 
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=create_error_response(
-                error_type="unexpected_error",
-                user_message="An unexpected error occurred during upload. The file was not saved.",
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                actions=[
-                    {
-                        "action": "retry",
-                        "description": "Try uploading again"
-                    },
-                    {
-                        "action": "contact_support",
-                        "description": f"If problem persists, contact support with correlation ID: {correlation_id}"
-                    }
-                ],
-                correlation_id=correlation_id,
-                developer_detail=f"{type(e).__name__}: {str(e)}"
-            )
-        )
+# Per-file-hash locks of in-flight uploads (entries vanish once unused)
+_upload_hash_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
 
+# Log label per PDF type
+_UPLOAD_LABELS = {"car": "CAR", "receipt": "Receipt"}
 
-@router.post("/receipt", response_model=PDFUploadResponse, status_code=status.HTTP_201_CREATED)
-async def upload_receipt_pdf(
+
+async def _handle_pdf_upload(
     request: Request,
-    file: UploadFile = File(..., description="Receipt PDF file"),
-    db: Session = Depends(get_db)
-):
+    file: UploadFile,
+    db: Session,
+    background_tasks: BackgroundTasks,
+    pdf_type: Literal["car", "receipt"]
+) -> PDFUploadResponse:
     """
-    Upload receipt collection PDF.
+    Validate, save, deduplicate and persist an uploaded PDF of either type.
 
     Features:
     - Early validation of file type and format
-    - Duplicate detection via SHA-256 hash (idempotent - returns existing PDF)
+    - Duplicate detection via BLAKE3 hash (idempotent - returns existing PDF)
     - Structured error responses with actionable next steps
     - Request correlation for distributed tracing
     - Comprehensive logging with context
 
+    Args:
+        request: Incoming request (for the shared timestamp)
+        file: Uploaded PDF file
+        db: Database session
+        background_tasks: Tasks run after the response (duplicate match reset)
+        pdf_type: Type of PDF ('car' or 'receipt')
+
     Returns:
         PDFUploadResponse: Metadata about uploaded PDF (new or existing)
 
@@ -568,42 +523,70 @@ async def upload_receipt_pdf(
         HTTPException 400: Bad request (corrupted file, unreadable)
         HTTPException 500: Server error (DB failure, unexpected error)
     """
+    label = _UPLOAD_LABELS[pdf_type]
+
     # Generate correlation ID for request tracing
-    correlation_id = str(uuid.uuid4())
+    correlation_id = uuid.uuid4().hex
 
     # Initialize variables for cleanup
     file_path = None
     filename = None
     file_hash = None
+    hash_lock = None
+
+    # Context shared by every error log of this upload
+    log_ctx = {"correlation_id": correlation_id, "filename": file.filename, "pdf_type": pdf_type}
 
     try:
         # ====================
         # 1. EARLY VALIDATION (before any processing)
         # ====================
-        validation_error = validate_upload_file(file, pdf_type="receipt")
-        if validation_error:
-            validation_error["correlation_id"] = correlation_id
-            raise HTTPException(
-                status_code=validation_error["status_code"],
-                detail=validation_error
-            )
+        validate_upload_file(file, pdf_type=pdf_type, correlation_id=correlation_id)
 
         logger.info(
-            f"[{correlation_id}] Receipt upload started | filename={file.filename}"
+            f"[{correlation_id}] {label} upload started | filename={file.filename}"
         )
 
         # ====================
-        # 2. SAVE & VALIDATE FILE (with hash calculation)
+        # 2. HASH, DEDUPLICATE, SAVE & VALIDATE FILE
         # ====================
         try:
-            file_path, filename, page_count, file_size, file_hash = await pdf_service.save_uploaded_file(
-                file, pdf_type="receipt"
-            )
+            # Hash the upload where Starlette spooled it, so a duplicate is
+            # answered without ever being written to the upload directory
+            file_size, file_hash = await pdf_service.hash_upload(file)
+            log_ctx["file_hash"] = file_hash
 
-            logger.info(
-                f"[{correlation_id}] File validated | "
-                f"filename={filename} pages={page_count} size={file_size}bytes hash={file_hash[:16]}..."
-            )
+            # Serialize uploads of the same file from the lookup to the insert:
+            # a concurrent duplicate waits, then finds the stored PDF and skips the save
+            lock = _upload_hash_locks.setdefault(file_hash, asyncio.Lock())
+            await lock.acquire()
+            hash_lock = lock
+
+            try:
+                duplicate_pdf = await asyncio.to_thread(
+                    deduplication_service.check_duplicate_pdf, file_hash, db
+                )
+            except SQLAlchemyError as lookup_error:
+                # The insert below still detects duplicates atomically
+                logger.warning(
+                    f"[{correlation_id}] Duplicate lookup failed, continuing with insert: {lookup_error}"
+                )
+                db.rollback()
+                duplicate_pdf = None
+
+            if duplicate_pdf is None:
+                file_path, filename = await pdf_service.save_uploaded_file(
+                    file, pdf_type=pdf_type
+                )
+                # Free the spooled copy now instead of when the request scope ends
+                await file.close()
+
+                page_count = await pdf_service.validate_saved_file(file_path)
+
+                logger.info(
+                    f"[{correlation_id}] File validated | "
+                    f"filename={filename} pages={page_count} size={file_size}bytes hash={file_hash[:16]}..."
+                )
 
         except ServicePDFValidationError as e:
             # Validation error - return 422 Unprocessable Entity
@@ -611,251 +594,161 @@ async def upload_receipt_pdf(
                 logger,
                 error_type="pdf_validation_failed",
                 message="PDF validation failed",
-                correlation_id=correlation_id,
-                filename=file.filename,
-                pdf_type="receipt",
+                now_iso=get_request_timestamp(request),
+                **log_ctx,
                 exception=e
             )
 
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail=create_error_response(
-                    error_type="pdf_validation_failed",
-                    user_message=f"Upload failed: {str(e)}",
-                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                    context={"filename": file.filename},
-                    actions=[
-                        {
-                            "action": "verify_pdf",
-                            "description": "Ensure the PDF is not corrupted or password-protected"
-                        },
-                        {
-                            "action": "check_requirements",
-                            "description": "Verify PDF meets requirements (max 300MB, 1-1500 pages, contains text)"
-                        }
-                    ],
-                    correlation_id=correlation_id,
-                    developer_detail=str(e)
-                )
+            # Cleanup uploaded file
+            if file_path:
+                await asyncio.to_thread(pdf_service.delete_file, file_path)
+
+            _reject_upload(
+                _ERR_PDF_VALIDATION_FAILED,
+                correlation_id,
+                get_request_timestamp(request),
+                message=f"Upload failed: {str(e)}",
+                context={"filename": file.filename},
+                developer_detail=str(e)
             )
 
         # ====================
-        # 3. DUPLICATE DETECTION
+        # 3. CREATE DATABASE RECORD (atomic on file_hash)
         # ====================
+        created = None
         try:
-            duplicate_pdf = deduplication_service.check_duplicate_pdf(file_hash, db)
-
-            if duplicate_pdf:
-                # Delete newly saved file (it's a duplicate)
-                pdf_service.delete_file(file_path)
-
-                # Count existing transactions
-                try:
-                    transaction_count = db.query(Transaction).filter(
-                        Transaction.pdf_id == duplicate_pdf.id
-                    ).count()
-                except SQLAlchemyError as count_error:
-                    logger.warning(
-                        f"[{correlation_id}] Failed to count transactions for duplicate: {count_error}"
-                    )
-                    transaction_count = 0  # Graceful degradation
-
-                # Clear any existing matches for this PDF's transactions
-                matches_cleared = 0
-                try:
-                    from models.transaction import Match
-
-                    # Get all transaction IDs for this PDF
-                    transaction_ids = db.query(Transaction.id).filter(
-                        Transaction.pdf_id == duplicate_pdf.id
-                    ).all()
-                    transaction_ids = [t[0] for t in transaction_ids]
-
-                    # Delete matches where either CAR or receipt is from this PDF
-                    if transaction_ids:
-                        matches_to_delete = db.query(Match).filter(
-                            (Match.car_transaction_id.in_(transaction_ids)) |
-                            (Match.receipt_transaction_id.in_(transaction_ids))
-                        )
-                        matches_cleared = matches_to_delete.count()
-                        matches_to_delete.delete(synchronize_session=False)
-
-                        # Reset is_matched flag for all transactions
-                        db.query(Transaction).filter(
-                            Transaction.id.in_(transaction_ids)
-                        ).update({"is_matched": False}, synchronize_session=False)
-
-                        db.commit()
-
-                        logger.info(
-                            f"[{correlation_id}] Cleared {matches_cleared} matches for duplicate PDF"
-                        )
-                except Exception as match_error:
-                    logger.warning(
-                        f"[{correlation_id}] Failed to clear matches: {match_error}"
-                    )
-                    db.rollback()
-                    matches_cleared = 0
-
-                logger.info(
-                    f"[{correlation_id}] Duplicate PDF detected, returning existing record | "
-                    f"original_id={duplicate_pdf.id} original_filename={duplicate_pdf.filename} "
-                    f"transactions={transaction_count} matches_cleared={matches_cleared}"
+            if duplicate_pdf is None:
+                # DB and file I/O run in a worker thread to keep the event loop free
+                prefix_hash = await asyncio.to_thread(
+                    deduplication_service.calculate_file_prefix_hash, file_path
                 )
-
-                # Return existing PDF record with duplicate flag
-                return PDFUploadResponse(
-                    pdf_id=duplicate_pdf.id,
-                    filename=duplicate_pdf.filename,
-                    pdf_type=duplicate_pdf.pdf_type,
-                    page_count=duplicate_pdf.page_count,
-                    file_size_bytes=duplicate_pdf.file_size_bytes,
-                    uploaded_at=duplicate_pdf.uploaded_at,
-                    is_duplicate=True,
-                    transaction_count=transaction_count,
-                    matches_cleared=matches_cleared
+                created = await asyncio.to_thread(
+                    deduplication_service.create_pdf_if_new,
+                    db,
+                    filename=filename,
+                    file_path=str(file_path.absolute()),
+                    file_hash=file_hash,
+                    prefix_hash=prefix_hash,
+                    pdf_type=pdf_type,
+                    page_count=page_count,
+                    file_size_bytes=file_size
                 )
 
+                # Insert hit an existing file_hash: a concurrent upload of the same file won
+                if not created:
+                    duplicate_pdf = await asyncio.to_thread(
+                        deduplication_service.check_duplicate_pdf, file_hash, db
+                    )
+
         except OperationalError as db_error:
-            # Database connectivity issue during duplicate check
+            # Database connectivity issue during insert or duplicate lookup
+            db.rollback()
+
             log_error_with_context(
                 logger,
                 error_type="database_connection_error",
-                message="Database connectivity issue during duplicate check",
-                correlation_id=correlation_id,
-                filename=filename,
-                file_hash=file_hash,
+                message="Database connectivity issue during PDF record creation",
+                now_iso=get_request_timestamp(request),
+                **log_ctx,
                 exception=db_error,
                 include_traceback=True
             )
 
             # Cleanup uploaded file
             if file_path:
-                pdf_service.delete_file(file_path)
-
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail=create_error_response(
-                    error_type="database_unavailable",
-                    user_message="Upload failed: Database is temporarily unavailable. Please try again in a moment.",
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    actions=[
-                        {
-                            "action": "retry",
-                            "description": "Retry the upload in a few seconds"
-                        }
-                    ],
-                    correlation_id=correlation_id,
-                    developer_detail=f"OperationalError: {str(db_error)}"
-                )
-            )
+                await asyncio.to_thread(pdf_service.delete_file, file_path)
 
-        # ====================
-        # 4. CREATE DATABASE RECORD
-        # ====================
-        try:
-            pdf_record = PDF(
-                filename=filename,
-                file_path=str(file_path.absolute()),
-                file_hash=file_hash,
-                pdf_type="receipt",
-                page_count=page_count,
-                file_size_bytes=file_size
+            _reject_upload(
+                _ERR_DATABASE_UNAVAILABLE,
+                correlation_id,
+                get_request_timestamp(request),
+                developer_detail=f"OperationalError: {str(db_error)}"
             )
 
-            db.add(pdf_record)
-            db.commit()
-            db.refresh(pdf_record)
-
-            logger.info(
-                f"[{correlation_id}] Receipt PDF saved successfully | "
-                f"pdf_id={pdf_record.id} filename={filename}"
-            )
-
-            # Return success response
-            return PDFUploadResponse(
-                pdf_id=pdf_record.id,
-                filename=pdf_record.filename,
-                pdf_type=pdf_record.pdf_type,
-                page_count=pdf_record.page_count,
-                file_size_bytes=pdf_record.file_size_bytes,
-                uploaded_at=pdf_record.uploaded_at
-            )
-
-        except IntegrityError as integrity_error:
-            # Race condition: duplicate was inserted between check and insert
+        except SQLAlchemyError as db_error:
+            # Database error during insert
             db.rollback()
 
             log_error_with_context(
                 logger,
-                error_type="integrity_error",
-                message="Database integrity error (possible race condition)",
-                correlation_id=correlation_id,
-                filename=filename,
-                file_hash=file_hash,
-                exception=integrity_error
+                error_type="database_error",
+                message="Database error during PDF record creation",
+                now_iso=get_request_timestamp(request),
+                **log_ctx,
+                exception=db_error,
+                include_traceback=True
             )
 
             # Cleanup uploaded file
             if file_path:
-                pdf_service.delete_file(file_path)
-
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail=create_error_response(
-                    error_type="duplicate_detected",
-                    user_message="This PDF has already been uploaded (detected during save).",
-                    status_code=status.HTTP_409_CONFLICT,
-                    actions=[
-                        {
-                            "action": "refresh_list",
-                            "description": "Refresh your PDF list to see the existing upload"
-                        }
-                    ],
-                    correlation_id=correlation_id,
-                    developer_detail=f"IntegrityError: {str(integrity_error)}"
-                )
+                await asyncio.to_thread(pdf_service.delete_file, file_path)
+
+            _reject_upload(
+                _ERR_DATABASE_ERROR,
+                correlation_id,
+                get_request_timestamp(request),
+                actions=_retry_or_contact_support_actions(correlation_id),
+                developer_detail=f"SQLAlchemyError: {str(db_error)}"
             )
 
-        except SQLAlchemyError as db_error:
-            # Database error during commit
-            db.rollback()
+        if created:
+            logger.info(
+                f"[{correlation_id}] {label} PDF saved successfully | "
+                f"pdf_id={created.id} filename={filename}"
+            )
 
-            log_error_with_context(
-                logger,
-                error_type="database_error",
-                message="Database error during PDF record creation",
-                correlation_id=correlation_id,
+            # Return success response
+            return PDFUploadResponse(
+                pdf_id=created.id,
                 filename=filename,
-                file_hash=file_hash,
-                exception=db_error,
-                include_traceback=True
+                pdf_type=pdf_type,
+                page_count=page_count,
+                file_size_bytes=file_size,
+                uploaded_at=created.uploaded_at
             )
 
-            # Cleanup uploaded file
-            if file_path:
-                pdf_service.delete_file(file_path)
-
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=create_error_response(
-                    error_type="database_error",
-                    user_message="Upload failed: Unable to save PDF metadata to database.",
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    actions=[
-                        {
-                            "action": "retry",
-                            "description": "Try uploading again"
-                        },
-                        {
-                            "action": "contact_support",
-                            "description": f"If problem persists, contact support with correlation ID: {correlation_id}"
-                        }
-                    ],
-                    correlation_id=correlation_id,
-                    developer_detail=f"SQLAlchemyError: {str(db_error)}"
-                )
+        # ====================
+        # 4. DUPLICATE HANDLING (file_hash already stored)
+        # ====================
+        # Delete the file saved before a concurrent upload won the insert
+        if file_path:
+            await asyncio.to_thread(pdf_service.delete_file, file_path)
+
+        if duplicate_pdf is None:
+            # Conflicting record was deleted between insert and lookup
+            _reject_upload(_ERR_DUPLICATE_DETECTED, correlation_id, get_request_timestamp(request))
+
+        # Report what will be reset; the writes run after the response is sent
+        try:
+            transaction_count, matches_cleared = await asyncio.to_thread(
+                deduplication_service.count_pdf_transactions_and_matches, duplicate_pdf.id, db
+            )
+        except SQLAlchemyError as count_error:
+            logger.warning(
+                f"[{correlation_id}] Failed to count transactions for duplicate: {count_error}"
             )
+            transaction_count, matches_cleared = 0, 0  # Graceful degradation
+
+        background_tasks.add_task(_reset_duplicate_pdf, duplicate_pdf.id, correlation_id)
+
+        logger.info(
+            f"[{correlation_id}] Duplicate PDF detected, returning existing record | "
+            f"original_id={duplicate_pdf.id} original_filename={duplicate_pdf.filename} "
+            f"transactions={transaction_count} matches_cleared={matches_cleared}"
+        )
+
+        # Return existing PDF record with duplicate flag
+        return PDFUploadResponse(
+            pdf_id=duplicate_pdf.id,
+            filename=duplicate_pdf.filename,
+            pdf_type=duplicate_pdf.pdf_type,
+            page_count=duplicate_pdf.page_count,
+            file_size_bytes=duplicate_pdf.file_size_bytes,
+            uploaded_at=duplicate_pdf.uploaded_at,
+            is_duplicate=True,
+            transaction_count=transaction_count,
+            matches_cleared=matches_cleared
+        )
 
     except HTTPException:
         # Re-raise HTTP exceptions (already handled)
@@ -866,11 +759,9 @@ async def upload_receipt_pdf(
         log_error_with_context(
             logger,
             error_type="unexpected_error",
-            message="Unexpected error during receipt upload",
-            correlation_id=correlation_id,
-            filename=filename,
-            file_hash=file_hash,
-            pdf_type="receipt",
+            message=f"Unexpected error during {label} upload",
+            now_iso=get_request_timestamp(request),
+            **log_ctx,
             exception=e,
             include_traceback=True
         )
@@ -878,27 +769,59 @@ async def upload_receipt_pdf(
         # Cleanup uploaded file if it exists
         if file_path:
             try:
-                pdf_service.delete_file(file_path)
+                await asyncio.to_thread(pdf_service.delete_file, file_path)
             except Exception as cleanup_error:
                 logger.error(f"[{correlation_id}] Cleanup failed: {cleanup_error}")
 
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=create_error_response(
-                error_type="unexpected_error",
-                user_message="An unexpected error occurred during upload. The file was not saved.",
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                actions=[
-                    {
-                        "action": "retry",
-                        "description": "Try uploading again"
-                    },
-                    {
-                        "action": "contact_support",
-                        "description": f"If problem persists, contact support with correlation ID: {correlation_id}"
-                    }
-                ],
-                correlation_id=correlation_id,
-                developer_detail=f"{type(e).__name__}: {str(e)}"
-            )
+        _reject_upload(
+            _ERR_UNEXPECTED,
+            correlation_id,
+            get_request_timestamp(request),
+            actions=_retry_or_contact_support_actions(correlation_id),
+            developer_detail=f"{type(e).__name__}: {str(e)}"
         )
+
+    finally:
+        if hash_lock is not None:
+            hash_lock.release()
+        await file.close()
+
+
+@router.post("/car", response_model=PDFUploadResponse, status_code=status.HTTP_201_CREATED)
+async def upload_car_pdf(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="CAR PDF file"),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload Corporate American Express Report (CAR) PDF.
+
+    Duplicate uploads are idempotent and return the existing PDF record;
+    its matches are cleared in the background.
+    See _handle_pdf_upload for validation and error responses.
+
+    Returns:
+        PDFUploadResponse: Metadata about uploaded PDF (new or existing)
+    """
+    return await _handle_pdf_upload(request, file, db, background_tasks, "car")
+
+
+@router.post("/receipt", response_model=PDFUploadResponse, status_code=status.HTTP_201_CREATED)
+async def upload_receipt_pdf(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(..., description="Receipt PDF file"),
+    db: Session = Depends(get_db)
+):
+    """
+    Upload receipt collection PDF.
+
+    Duplicate uploads are idempotent and return the existing PDF record;
+    its matches are cleared in the background.
+    See _handle_pdf_upload for validation and error responses.
+
+    Returns:
+        PDFUploadResponse: Metadata about uploaded PDF (new or existing)
+    """
+    return await _handle_pdf_upload(request, file, db, background_tasks, "receipt")
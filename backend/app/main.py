@@ -1,30 +1,40 @@
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
-import traceback
 import logging
+import logging.config
 
 import sys
 from pathlib import Path
 
-# Add backend directory to Python path
-backend_dir = Path(__file__).parent.parent
-sys.path.insert(0, str(backend_dir))
+# Add backend directory to Python path (once, even if re-imported)
+backend_dir = str(Path(__file__).parent.parent)
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
 
 from models.base import create_tables
-from api.routes import upload, health, extraction, matching, export, deduplication
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,  # Changed from DEBUG
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
-
-# Reduce verbosity of third-party libraries
-logging.getLogger('pdfminer').setLevel(logging.WARNING)
-logging.getLogger('PIL').setLevel(logging.WARNING)
-logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
+from services import process_pool
+from api.routes import upload, health, extraction, matching, export, deduplication, jobs
+
+# Logging configuration, applied once per process at startup
+LOGGING_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,  # Keep uvicorn's loggers
+    "formatters": {
+        "default": {"format": "%(asctime)s - %(name)s - %(levelname)s - %(message)s"},
+    },
+    "handlers": {
+        "default": {"class": "logging.StreamHandler", "formatter": "default"},
+    },
+    "root": {"level": "INFO", "handlers": ["default"]},
+    # Reduce verbosity of third-party libraries
+    "loggers": {
+        "pdfminer": {"level": "WARNING"},
+        "PIL": {"level": "WARNING"},
+        "sqlalchemy.engine": {"level": "WARNING"},
+    },
+}
 
 logger = logging.getLogger(__name__)
 
@@ -35,13 +45,16 @@ async def lifespan(app: FastAPI):
     Lifespan context manager for startup/shutdown events.
 
     Startup:
+    - Configure logging
     - Create database tables if they don't exist
     - Initialize services
 
     Shutdown:
+    - Stop the shared process pool's workers
     - Clean up resources
     """
     # Startup
+    logging.config.dictConfig(LOGGING_CONFIG)
     print("Starting PDF Transaction Matcher API...")
     create_tables()
     print("Database tables created/verified")
@@ -50,6 +63,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     print("Shutting down PDF Transaction Matcher API...")
+    process_pool.shutdown_executor()
 
 
 # Create FastAPI application
@@ -64,27 +78,59 @@ app = FastAPI(
     - Force re-extraction capability
     """,
     version="1.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
-# Add exception handler middleware for debugging
-@app.middleware("http")
-async def log_exceptions(request: Request, call_next):
-    try:
-        response = await call_next(request)
-        return response
-    except Exception as e:
-        logger.error(f"Unhandled exception: {type(e).__name__}: {e}")
-        logger.error(traceback.format_exc())
-        return JSONResponse(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={
-                "error": "server_error",
-                "message": str(e),
-                "type": type(e).__name__,
-                "traceback": traceback.format_exc()
-            }
-        )
+class ExceptionLoggingMiddleware:
+    """
+    Log unhandled exceptions once and answer them with a JSON 500.
+
+    A plain ASGI middleware (no per-request BaseHTTPMiddleware task or
+    stream wrapping); it sits inside CORS so error responses still carry
+    CORS headers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            # The traceback is attached to the log record, not the response
+            logger.exception(f"Unhandled exception: {type(e).__name__}: {e}")
+            if response_started:
+                raise
+            response = JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={
+                    "error": "server_error",
+                    "message": str(e),
+                    "type": type(e).__name__
+                }
+            )
+            await response(scope, receive, send)
+
+
+# Answer unhandled exceptions with a JSON 500 (innermost middleware)
+app.add_middleware(ExceptionLoggingMiddleware)
+
+# Reject invalid uploads while the body is still arriving (inside CORS so
+# rejections still carry CORS headers)
+app.add_middleware(upload.UploadPrecheckMiddleware)
 
 # Configure CORS (allow frontend to make requests)
 app.add_middleware(
@@ -93,6 +139,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-PDF-Id"],  # Returned by HEAD /api/dedup/by-hash/{file_hash}
 )
 
 # Include routers
@@ -102,6 +149,7 @@ app.include_router(extraction.router)
 app.include_router(matching.router)
 app.include_router(export.router)
 app.include_router(deduplication.router)
+app.include_router(jobs.router)
 
 
 if __name__ == "__main__":
@@ -1,24 +1,22 @@
 """Check database schema using raw SQL"""
 import sqlite3
+from contextlib import closing
 from pathlib import Path
 
 db_path = Path("data/expense_matcher.db")
-conn = sqlite3.connect(db_path)
-cursor = conn.cursor()
 
-print("=== PDFs table schema ===")
-cursor.execute("PRAGMA table_info(pdfs)")
-for row in cursor.fetchall():
-    print(f"  {row[1]}: {row[2]} (NULL={row[3]==0})")
+with closing(sqlite3.connect(db_path)) as conn:
+    print("=== Tables and indexes ===")
+    # Auto-created indexes (sql IS NULL) have no DDL to show
+    for name, ddl in conn.execute(
+        "SELECT name, sql FROM sqlite_master "
+        "WHERE type IN ('table', 'index') AND sql IS NOT NULL ORDER BY tbl_name, type DESC, name"
+    ):
+        print(f"\n-- {name}")
+        print(ddl)
 
-print("\n=== Transactions table schema ===")
-cursor.execute("PRAGMA table_info(transactions)")
-for row in cursor.fetchall():
-    print(f"  {row[1]}: {row[2]} (NULL={row[3]==0})")
+    print("\n=== Alembic version ===")
+    version = conn.execute("SELECT version_num FROM alembic_version").fetchone()
+    print(f"  Current: {version[0] if version else None}")
 
-print("\n=== Alembic version ===")
-cursor.execute("SELECT version_num FROM alembic_version")
-print(f"  Current: {cursor.fetchone()[0]}")
-
-conn.close()
 print("\nSchema check complete")
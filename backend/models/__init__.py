@@ -1,6 +1,6 @@
 from .base import Base, get_db, create_tables, drop_tables
 from .pdf import PDF
-from .transaction import Transaction, Match
+from .transaction import Transaction, Match, TableVersion
 
 __all__ = [
     "Base",
@@ -9,5 +9,6 @@ __all__ = [
     "drop_tables",
     "PDF",
     "Transaction",
-    "Match"
+    "Match",
+    "TableVersion"
 ]
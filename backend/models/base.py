@@ -3,6 +3,7 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from typing import Generator
 from pathlib import Path
+import os
 
 # Database URL - SQLite file in data directory (absolute path)
 DB_DIR = Path(__file__).parent.parent.parent / "data"
@@ -10,18 +11,32 @@ DB_DIR.mkdir(parents=True, exist_ok=True)
 DATABASE_URL = f"sqlite:///{DB_DIR / 'expense_matcher.db'}"
 
 # Create engine (SQLite doesn't support async, use sync for simplicity)
+# Pool is sized for the sync route threadpool (40 threads by default) so
+# concurrent requests don't queue on the default 5 + 10 connections; LIFO
+# reuse keeps the working set of connections small when idle.
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},  # Needed for SQLite
-    echo=True,  # Log SQL queries (disable in production)
+    echo=os.getenv("DB_ECHO", "false").lower() == "true",  # Log SQL queries
+    pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+    max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
+    pool_use_lifo=True,
 )
 
 # Enable foreign key constraints for SQLite (required for CASCADE deletes)
+# and tune each connection for concurrent requests
 @event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_conn, connection_record):
-    """Enable foreign key constraints in SQLite."""
+    """Enable foreign key constraints and WAL mode in SQLite."""
     cursor = dbapi_conn.cursor()
     cursor.execute("PRAGMA foreign_keys=ON")
+    # WAL lets readers run while a write commits; with WAL, NORMAL sync
+    # skips the per-commit fsync and stays crash-safe
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MiB
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB per connection
     cursor.close()
 
 # Session maker
@@ -25,7 +25,8 @@ class PDF(Base):
     file_size_bytes = Column(Integer, nullable=False)
 
     # Deduplication
-    file_hash = Column(String(64), nullable=True, index=True)  # SHA-256 hash of file content
+    file_hash = Column(String(64), nullable=True)  # BLAKE3 hash of file content (unique, indexed by uq_pdf_file_hash)
+    prefix_hash = Column(String(64), nullable=True)  # BLAKE3 hash of first 64KB (duplicate pre-check)
 
     # Timestamps
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -33,6 +34,7 @@ class PDF(Base):
     # Table constraints
     __table_args__ = (
         UniqueConstraint('file_hash', name='uq_pdf_file_hash'),
+        Index('ix_pdf_size_prefix_hash', 'file_size_bytes', 'prefix_hash'),
     )
 
     def __repr__(self):
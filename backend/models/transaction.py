@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, Date, Text, ForeignKey, Boolean, Index, UniqueConstraint
+from sqlalchemy import Column, String, Integer, Float, DateTime, Date, Text, ForeignKey, Boolean, Index, UniqueConstraint, DDL, event
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .base import Base
@@ -65,7 +65,9 @@ class Transaction(Base):
             'date', 'amount', 'employee_id', 'transaction_type',
             name='uq_transaction_content'
         ),
-        Index('idx_content_fingerprint', 'content_fingerprint'),
+        # pdf_id leads, so this also serves plain pdf_id lookups
+        Index('ix_transactions_pdf_matched', 'pdf_id', 'is_matched'),
+        Index('ix_transactions_type_matched', 'transaction_type', 'is_matched'),
     )
 
     def __repr__(self):
@@ -99,6 +101,33 @@ class Transaction(Base):
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
 
+    def to_response_dict(self):
+        """
+        Convert model to the TransactionResponse shape without Pydantic validation.
+
+        Field names and formats match TransactionResponse serialization
+        (dates are rendered as midnight datetimes).
+        """
+        return {
+            "transaction_type": self.transaction_type,
+            "date": f"{self.date.isoformat()}T00:00:00" if self.date else None,
+            "amount": self.amount,
+            "employee_id": self.employee_id,
+            "employee_name": self.employee_name,
+            "merchant": self.merchant,
+            "card_number": self.card_number,
+            "receipt_id": self.receipt_id,
+            "page_number": self.page_number,
+            "raw_text": self.raw_text,
+            "extraction_confidence": self.extraction_confidence,
+            "transaction_id": self.id,
+            "pdf_id": self.pdf_id,
+            "is_matched": self.is_matched,
+            "extracted_at": self.extracted_at.isoformat() if self.extracted_at else None,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+        }
+
 
 class Match(Base):
     """
@@ -145,6 +174,14 @@ class Match(Base):
     matched_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Table constraints
+    __table_args__ = (
+        Index('ix_matches_status', 'status'),
+        Index('ix_matches_exported', 'exported'),
+        Index('ix_matches_car_transaction_id', 'car_transaction_id'),
+        Index('ix_matches_receipt_transaction_id', 'receipt_transaction_id'),
+    )
+
     def __repr__(self):
         return (
             f"<Match(id={self.id}, confidence={self.confidence_score:.2f}, "
@@ -171,3 +208,65 @@ class Match(Base):
             "matched_at": self.matched_at.isoformat() if self.matched_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None
         }
+
+    def to_response_dict(self):
+        """
+        Convert model to the MatchWithTransactionsResponse shape without Pydantic validation.
+
+        Field names and formats match MatchWithTransactionsResponse
+        serialization; both transactions must be loaded.
+        """
+        return {
+            "car_transaction_id": self.car_transaction_id,
+            "receipt_transaction_id": self.receipt_transaction_id,
+            "confidence_score": self.confidence_score,
+            "date_score": self.date_score,
+            "amount_score": self.amount_score,
+            "employee_score": self.employee_score,
+            "merchant_score": self.merchant_score,
+            "match_id": self.id,
+            "status": self.status,
+            "manually_reviewed": self.manually_reviewed,
+            "review_notes": self.review_notes,
+            "exported": self.exported,
+            "export_path": self.export_path,
+            "exported_at": self.exported_at.isoformat() if self.exported_at else None,
+            "matched_at": self.matched_at.isoformat() if self.matched_at else None,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "car_transaction": self.car_transaction.to_response_dict(),
+            "receipt_transaction": self.receipt_transaction.to_response_dict()
+        }
+
+
+class TableVersion(Base):
+    """
+    Write counter per table, bumped by database triggers.
+
+    Lets readers detect any committed change (from any process) with one
+    primary key lookup; created_at/updated_at only have one-second
+    resolution on SQLite.
+    """
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<TableVersion(table_name={self.table_name}, version={self.version})>"
+
+
+# Row-level triggers bumping table_versions['transactions'] on every write
+# (the alembic migration creates the same triggers)
+TRANSACTION_VERSION_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS trg_transactions_version_{operation.lower()} "
+    f"AFTER {operation} ON transactions "
+    "BEGIN "
+    "INSERT INTO table_versions (table_name, version) VALUES ('transactions', 1) "
+    "ON CONFLICT (table_name) DO UPDATE SET version = version + 1; "
+    "END"
+    for operation in ("INSERT", "UPDATE", "DELETE")
+]
+
+for _trigger_sql in TRANSACTION_VERSION_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(_trigger_sql).execute_if(dialect="sqlite"))
+
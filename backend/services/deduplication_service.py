@@ -1,15 +1,65 @@
 """
 Deduplication service for PDF and transaction duplicate detection.
 """
+import asyncio
 import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple
+from typing import BinaryIO, Optional, List, Dict, Tuple
 from datetime import date
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy import and_, or_, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+import blake3
 
 from models.pdf import PDF
-from models.transaction import Transaction
+from models.transaction import Transaction, Match
+
+# Inputs smaller than this are hashed on one thread; handing them to the
+# BLAKE3 thread pool costs more than the parallel hashing saves
+PARALLEL_HASH_MIN_BYTES = 256 * 1024
+
+
+def _new_file_hasher(size: Optional[int] = None):
+    """Create a BLAKE3 hasher that spreads large (or unknown-size) inputs across CPU cores."""
+    if size is not None and size < PARALLEL_HASH_MIN_BYTES:
+        return blake3.blake3()
+    return blake3.blake3(max_threads=blake3.blake3.AUTO)
+
+
+@lru_cache(maxsize=4096)
+def _hash_file_version(path: str, size: int, mtime_ns: int) -> str:
+    """Hash a specific version of a file; size/mtime_ns only serve as cache key."""
+    # mmap lets BLAKE3 hash the file in parallel without copying it
+    return _new_file_hasher(size).update_mmap(path).hexdigest()
+
+
+@lru_cache(maxsize=100_000)
+def _transaction_fingerprint(
+    transaction_date, amount, employee_id: Optional[str], transaction_type: Optional[str]
+) -> str:
+    """Fingerprint a transaction's business keys; memoized for re-extractions."""
+    # Normalize components
+    date_str = ""
+    if transaction_date:
+        if isinstance(transaction_date, date):
+            date_str = transaction_date.isoformat()
+        elif isinstance(transaction_date, str):
+            date_str = transaction_date
+
+    amount_str = ""
+    if amount is not None:
+        # Round to 2 decimal places for consistent comparison
+        amount_str = f"{float(amount):.2f}"
+
+    # Combine with delimiter
+    fingerprint_str = f"{date_str}|{amount_str}|{employee_id or ''}|{transaction_type or ''}"
+
+    return hashlib.sha256(fingerprint_str.encode('utf-8')).hexdigest()
 
 
 class DuplicateDetectedError(Exception):
@@ -22,9 +72,28 @@ class DuplicateDetectedError(Exception):
 class DeduplicationService:
     """Service for detecting and handling duplicate PDFs and transactions."""
 
+    # Leading bytes hashed for the (file_size_bytes, prefix_hash) pre-check
+    PREFIX_HASH_BYTES = 64 * 1024
+
+    # Fingerprints per IN (...) query in check_duplicates_bulk
+    BULK_LOOKUP_CHUNK_SIZE = 500
+
+    # Recently found PDFs kept per file_hash by check_duplicate_pdf
+    PDF_LOOKUP_CACHE_SIZE = 1024
+    PDF_LOOKUP_CACHE_TTL = 60.0  # seconds
+
+    def __init__(self):
+        """Initialize the PDF lookup cache."""
+        # (bind, file_hash) -> (expires_at, detached PDF snapshot)
+        self._pdf_lookup_cache: OrderedDict = OrderedDict()
+        self._pdf_lookup_lock = threading.Lock()
+
     def calculate_file_hash(self, file_path: Path) -> str:
         """
-        Calculate SHA-256 hash of file content.
+        Calculate BLAKE3 hash of file content.
+
+        Results are cached per (path, size, mtime), so repeated checks of an
+        unchanged file skip re-reading it.
 
         Args:
             file_path: Path to file
@@ -35,18 +104,47 @@ class DeduplicationService:
         Raises:
             IOError: If file cannot be read
         """
-        sha256 = hashlib.sha256()
+        # Cache key includes size and mtime so rewritten files are rehashed
+        stat = os.stat(file_path)
+        return _hash_file_version(os.fspath(file_path), stat.st_size, stat.st_mtime_ns)
 
-        with open(file_path, 'rb') as f:
-            # Read in 8KB chunks to handle large files
-            while chunk := f.read(8192):
-                sha256.update(chunk)
+    def calculate_file_hash_from_fileobj(self, fileobj: BinaryIO) -> str:
+        """
+        Calculate BLAKE3 hash of the whole content of a binary file object.
+
+        Uses hashlib.file_digest to run the read/update loop without
+        per-chunk Python allocations. The object is rewound first:
+        file_digest hashes a BytesIO's entire buffer regardless of position,
+        so hashing from the start keeps every file object consistent.
+
+        Args:
+            fileobj: Seekable file object opened in binary mode
+
+        Returns:
+            64-character hex digest
+        """
+        fileobj.seek(0)
+        return hashlib.file_digest(fileobj, _new_file_hasher).hexdigest()
 
-        return sha256.hexdigest()
+    def create_file_hasher(self, size: Optional[int] = None):
+        """
+        Create an incremental hasher for the file_hash algorithm.
+
+        Lets callers hash a file while copying it (update() per chunk,
+        hexdigest() at the end) instead of re-reading it afterwards.
+
+        Args:
+            size: Total input size in bytes, if known (small inputs are
+                hashed single-threaded)
+
+        Returns:
+            BLAKE3 hasher
+        """
+        return _new_file_hasher(size)
 
     def calculate_file_hash_from_bytes(self, content: bytes) -> str:
         """
-        Calculate SHA-256 hash from file bytes.
+        Calculate BLAKE3 hash from file bytes.
 
         Useful for uploaded files before they're written to disk.
 
@@ -56,7 +154,47 @@ class DeduplicationService:
         Returns:
             64-character hex digest
         """
-        return hashlib.sha256(content).hexdigest()
+        return _new_file_hasher(len(content)).update(content).hexdigest()
+
+    def calculate_prefix_hash(self, fileobj: BinaryIO) -> str:
+        """
+        Calculate BLAKE3 hash of the first PREFIX_HASH_BYTES of a file object.
+
+        Args:
+            fileobj: File object opened in binary mode, positioned at the start
+
+        Returns:
+            64-character hex digest
+        """
+        return blake3.blake3(fileobj.read(self.PREFIX_HASH_BYTES)).hexdigest()
+
+    def calculate_file_prefix_hash(self, file_path: Path) -> str:
+        """
+        Calculate the prefix hash of a file on disk.
+
+        Args:
+            file_path: Path to file
+
+        Returns:
+            64-character hex digest
+        """
+        with open(file_path, 'rb') as f:
+            return self.calculate_prefix_hash(f)
+
+    async def calculate_file_hash_from_stream(self, file) -> str:
+        """
+        Calculate BLAKE3 hash of an upload without loading it into memory.
+
+        Hashes the underlying spooled file in a worker thread so the event
+        loop is not blocked for large uploads.
+
+        Args:
+            file: FastAPI UploadFile object
+
+        Returns:
+            64-character hex digest
+        """
+        return await asyncio.to_thread(self.calculate_file_hash_from_fileobj, file.file)
 
     def calculate_transaction_fingerprint(self, transaction_data: Dict) -> str:
         """
@@ -70,39 +208,100 @@ class DeduplicationService:
         Returns:
             64-character hex digest
         """
-        # Normalize components
-        date_str = ""
-        if transaction_data.get('date'):
-            if isinstance(transaction_data['date'], date):
-                date_str = transaction_data['date'].isoformat()
-            elif isinstance(transaction_data['date'], str):
-                date_str = transaction_data['date']
+        return _transaction_fingerprint(
+            transaction_data.get('date'),
+            transaction_data.get('amount'),
+            transaction_data.get('employee_id'),
+            transaction_data.get('transaction_type')
+        )
+
+    def check_duplicate_pdf(self, file_hash: str, db: Session) -> Optional[PDF]:
+        """
+        Check if a PDF with the same hash already exists.
 
-        amount_str = ""
-        if transaction_data.get('amount') is not None:
-            # Round to 2 decimal places for consistent comparison
-            amount_str = f"{float(transaction_data['amount']):.2f}"
+        Args:
+            file_hash: BLAKE3 hash of PDF content
+            db: Database session
 
-        employee_id = transaction_data.get('employee_id') or ""
-        transaction_type = transaction_data.get('transaction_type') or ""
+        Returns:
+            Existing PDF record if found, None otherwise
+        """
+        # PDF rows are never updated or deleted once stored, so a recent
+        # hit can be merged into the session without querying again
+        key = (db.get_bind(), file_hash)
+        now = time.monotonic()
+        with self._pdf_lookup_lock:
+            cached = self._pdf_lookup_cache.get(key)
+            if cached and cached[0] > now:
+                self._pdf_lookup_cache.move_to_end(key)
+                return db.merge(cached[1], load=False)
+
+        pdf = db.query(PDF).filter(PDF.file_hash == file_hash).first()
+
+        # Misses are not cached: the upload that follows one inserts the hash
+        if pdf is not None:
+            snapshot = PDF(**{
+                column.key: getattr(pdf, column.key) for column in PDF.__table__.columns
+            })
+            make_transient_to_detached(snapshot)
+            with self._pdf_lookup_lock:
+                self._pdf_lookup_cache[key] = (now + self.PDF_LOOKUP_CACHE_TTL, snapshot)
+                self._pdf_lookup_cache.move_to_end(key)
+                if len(self._pdf_lookup_cache) > self.PDF_LOOKUP_CACHE_SIZE:
+                    self._pdf_lookup_cache.popitem(last=False)
+
+        return pdf
+
+    def create_pdf_if_new(self, db: Session, **fields):
+        """
+        Insert a PDF record unless one with the same file_hash already exists.
 
-        # Combine with delimiter
-        fingerprint_str = f"{date_str}|{amount_str}|{employee_id}|{transaction_type}"
+        Uses INSERT ... ON CONFLICT (file_hash) DO NOTHING RETURNING, so new
+        uploads need no duplicate pre-check query and a concurrent duplicate
+        upload cannot fail with IntegrityError.
 
-        return hashlib.sha256(fingerprint_str.encode('utf-8')).hexdigest()
+        Args:
+            db: Database session
+            **fields: PDF column values (including file_hash)
 
-    def check_duplicate_pdf(self, file_hash: str, db: Session) -> Optional[PDF]:
+        Returns:
+            Row with (id, uploaded_at) of the new record, or None if a PDF
+            with this file_hash already exists
         """
-        Check if a PDF with the same hash already exists.
+        stmt = sqlite_insert(PDF).values(**fields).on_conflict_do_nothing(
+            index_elements=[PDF.file_hash]
+        ).returning(PDF.id, PDF.uploaded_at)
+
+        created = db.execute(stmt).first()
+        db.commit()
+
+        return created
+
+    def check_duplicate_by_prefix(
+        self,
+        file_size: int,
+        prefix_hash: str,
+        db: Session
+    ) -> Optional[PDF]:
+        """
+        Find a PDF that could share content with a file of this size and prefix.
+
+        A candidate only means the full hash must still be compared; no
+        candidate means the file is definitely not a duplicate. PDFs stored
+        before prefix hashes were recorded match on size alone.
 
         Args:
-            file_hash: SHA-256 hash of PDF content
+            file_size: File size in bytes
+            prefix_hash: Hash from calculate_prefix_hash
             db: Database session
 
         Returns:
-            Existing PDF record if found, None otherwise
+            Candidate PDF record if found, None otherwise
         """
-        return db.query(PDF).filter(PDF.file_hash == file_hash).first()
+        return db.query(PDF).filter(
+            PDF.file_size_bytes == file_size,
+            or_(PDF.prefix_hash == prefix_hash, PDF.prefix_hash.is_(None))
+        ).first()
 
     def check_duplicate_transaction(
         self,
@@ -123,6 +322,36 @@ class DeduplicationService:
             Transaction.content_fingerprint == fingerprint
         ).first()
 
+    def check_duplicates_bulk(
+        self,
+        fingerprints: List[str],
+        db: Session
+    ) -> Dict[str, str]:
+        """
+        Look up many transaction fingerprints at once.
+
+        Args:
+            fingerprints: Content fingerprint hashes
+            db: Database session
+
+        Returns:
+            Dict mapping each fingerprint that already exists to the ID of
+            an existing transaction with it
+        """
+        existing = {}
+        unique_fingerprints = list(set(fingerprints))
+
+        # Chunk to stay well under SQLite's bound-parameter limit
+        for i in range(0, len(unique_fingerprints), self.BULK_LOOKUP_CHUNK_SIZE):
+            chunk = unique_fingerprints[i:i + self.BULK_LOOKUP_CHUNK_SIZE]
+            rows = db.query(Transaction.content_fingerprint, Transaction.id).filter(
+                Transaction.content_fingerprint.in_(chunk)
+            ).all()
+            for fingerprint, transaction_id in rows:
+                existing.setdefault(fingerprint, transaction_id)
+
+        return existing
+
     def check_duplicate_transaction_by_fields(
         self,
         date_val: Optional[date],
@@ -162,8 +391,6 @@ class DeduplicationService:
         Returns:
             List of (fingerprint, [transactions]) tuples
         """
-        from sqlalchemy import func
-
         # Find fingerprints with multiple transactions
         duplicate_fingerprints = db.query(
             Transaction.content_fingerprint,
@@ -183,6 +410,78 @@ class DeduplicationService:
 
         return result
 
+    def count_pdf_transactions_and_matches(self, pdf_id: str, db: Session) -> Tuple[int, int]:
+        """
+        Count a PDF's transactions and the matches that involve them.
+
+        Both counts are scalar subqueries of a single SELECT, so the
+        duplicate-upload response costs one round-trip.
+
+        Args:
+            pdf_id: ID of the PDF
+            db: Database session
+
+        Returns:
+            Tuple of (transaction_count, match_count)
+        """
+        pdf_transaction_ids = select(Transaction.id).where(
+            Transaction.pdf_id == pdf_id
+        ).scalar_subquery()
+
+        # COUNT(*) is answered from the indexes alone
+        transaction_count_query = select(func.count()).select_from(Transaction).where(
+            Transaction.pdf_id == pdf_id
+        ).scalar_subquery()
+        match_count_query = select(func.count()).select_from(Match).where(
+            or_(
+                Match.car_transaction_id.in_(pdf_transaction_ids),
+                Match.receipt_transaction_id.in_(pdf_transaction_ids)
+            )
+        ).scalar_subquery()
+
+        transaction_count, match_count = db.query(
+            transaction_count_query, match_count_query
+        ).one()
+
+        return transaction_count, match_count
+
+    def reset_pdf_transactions(self, pdf_id: str, db: Session) -> Tuple[int, int]:
+        """
+        Clear all matches involving a PDF's transactions and reset their is_matched flags.
+
+        Used when a duplicate upload returns the existing PDF so it can be
+        re-matched from scratch. Transaction IDs are selected by subquery in
+        the database instead of being materialized in Python, and the UPDATE
+        row count doubles as the transaction count.
+
+        Args:
+            pdf_id: ID of the existing PDF
+            db: Database session
+
+        Returns:
+            Tuple of (transaction_count, matches_cleared)
+        """
+        pdf_transaction_ids = db.query(Transaction.id).filter(
+            Transaction.pdf_id == pdf_id
+        ).scalar_subquery()
+
+        # Delete matches where either CAR or receipt is from this PDF
+        matches_cleared = db.query(Match).filter(
+            or_(
+                Match.car_transaction_id.in_(pdf_transaction_ids),
+                Match.receipt_transaction_id.in_(pdf_transaction_ids)
+            )
+        ).delete(synchronize_session=False)
+
+        # Reset is_matched flag for all transactions; every row of the PDF matches
+        transaction_count = db.query(Transaction).filter(
+            Transaction.pdf_id == pdf_id
+        ).update({"is_matched": False}, synchronize_session=False)
+
+        db.commit()
+
+        return transaction_count, matches_cleared
+
     def mark_as_duplicate(
         self,
         transaction: Transaction,
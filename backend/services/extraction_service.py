@@ -4,6 +4,39 @@ import re
 from datetime import datetime
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from contextlib import contextmanager
+import math
+import mmap
+import os
+
+from services import process_pool
+
+# PDFs at least this large are memory-mapped instead of read through a
+# buffered file, so pdfminer's many small seek+read calls don't hit the kernel
+MMAP_THRESHOLD_BYTES = 4 * 1024 * 1024
+
+
+@contextmanager
+def _open_pdf(pdf_path):
+    """
+    Open a PDF with pdfplumber from a single file descriptor.
+
+    Raises:
+        FileNotFoundError: If the PDF file does not exist
+    """
+    with open(pdf_path, "rb") as fh:
+        if hasattr(os, "posix_fadvise"):
+            # Start asynchronous kernel readahead of the whole file so disk
+            # reads overlap with parsing (pdfminer jumps to the xref first)
+            os.posix_fadvise(fh.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+
+        if os.fstat(fh.fileno()).st_size >= MMAP_THRESHOLD_BYTES:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with pdfplumber.open(mapped) as pdf:
+                    yield pdf
+        else:
+            with pdfplumber.open(fh) as pdf:
+                yield pdf
 
 
 @dataclass
@@ -49,10 +82,55 @@ class ExtractionService:
     RECEIPT_EMPLOYEE_PATTERN = r'(?:Employee|EE|ID)[\s:]*([A-Z\s,]+?)[\s,]+(\d{4,6})'
     RECEIPT_MERCHANT_PATTERN = r'^([A-Z][A-Z0-9\s\-\.&]+?)(?=\n|\s{2,})'
 
+    # Page text extraction is spread over the shared process pool for large PDFs
+    MIN_PAGES_PER_TASK = 25
+
     def __init__(self):
         """Initialize extraction service."""
         pass
 
+    def extract_page_texts(self, pdf_path: Path) -> List[Tuple[int, Optional[str]]]:
+        """
+        Extract the text of every page, in page order.
+
+        pdfplumber layout analysis is CPU-bound and independent per page, so
+        PDFs with at least two MIN_PAGES_PER_TASK page ranges are split into
+        one range per worker (see process_pool.get_max_workers) and extracted
+        in the shared process pool.
+
+        Args:
+            pdf_path: Path to PDF file
+
+        Returns:
+            List of (page_number, text) tuples (1-indexed, text may be None)
+
+        Raises:
+            FileNotFoundError: If the PDF file does not exist
+        """
+        with _open_pdf(pdf_path) as pdf:
+            page_count = len(pdf.pages)
+            workers = process_pool.get_max_workers(page_count // self.MIN_PAGES_PER_TASK)
+
+            if workers <= 1:
+                return [
+                    (page_num, page.extract_text())
+                    for page_num, page in enumerate(pdf.pages, start=1)
+                ]
+
+        pages_per_task = math.ceil(page_count / workers)
+        executor = process_pool.get_executor()
+        futures = [
+            executor.submit(_extract_page_range_texts, str(pdf_path), start, min(start + pages_per_task, page_count))
+            for start in range(0, page_count, pages_per_task)
+        ]
+
+        # Futures are collected in submission order, which is page order
+        page_texts = []
+        for future in futures:
+            page_texts.extend(future.result())
+
+        return page_texts
+
     def extract_car_transactions(self, pdf_path: Path) -> List[ExtractedTransaction]:
         """
         Extract transactions from CAR (Corporate American Express Report) PDF.
@@ -64,66 +142,67 @@ class ExtractionService:
             List of ExtractedTransaction objects
 
         Raises:
+            FileNotFoundError: If the PDF file does not exist
             ExtractionError: If extraction fails
         """
         transactions = []
 
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                current_employee_info = None
+            current_employee_info = None
 
-                for page_num, page in enumerate(pdf.pages, start=1):
-                    text = page.extract_text()
-                    if not text:
-                        continue
+            for page_num, text in self.extract_page_texts(pdf_path):
+                if not text:
+                    continue
 
-                    # Extract employee info from page header (now on separate lines)
-                    employee_id_match = re.search(self.CAR_EMPLOYEE_ID_PATTERN, text)
-                    card_number_match = re.search(self.CAR_CARD_NUMBER_PATTERN, text)
-                    cardholder_name_match = re.search(self.CAR_CARDHOLDER_NAME_PATTERN, text)
-
-                    if employee_id_match and card_number_match:
-                        current_employee_info = {
-                            'employee_id': employee_id_match.group('employee_id').strip(),
-                            'employee_name': cardholder_name_match.group('cardholder_name').strip() if cardholder_name_match else None,
-                            'card_number': card_number_match.group('card_number').strip()
-                        }
-
-                    # Find the transaction header line
-                    header_match = re.search(self.CAR_TRANSACTION_HEADER_PATTERN, text)
-                    if not header_match:
-                        continue
+                # Extract employee info from page header (now on separate lines)
+                employee_id_match = re.search(self.CAR_EMPLOYEE_ID_PATTERN, text)
+                card_number_match = re.search(self.CAR_CARD_NUMBER_PATTERN, text)
+                cardholder_name_match = re.search(self.CAR_CARDHOLDER_NAME_PATTERN, text)
+
+                if employee_id_match and card_number_match:
+                    current_employee_info = {
+                        'employee_id': employee_id_match.group('employee_id').strip(),
+                        'employee_name': cardholder_name_match.group('cardholder_name').strip() if cardholder_name_match else None,
+                        'card_number': card_number_match.group('card_number').strip()
+                    }
+
+                # Find the transaction header line
+                header_match = re.search(self.CAR_TRANSACTION_HEADER_PATTERN, text)
+                if not header_match:
+                    continue
 
-                    # Extract transaction lines (lines that start with a date pattern)
-                    lines = text.split('\n')
-                    in_transaction_section = False
+                # Extract transaction lines (lines that start with a date pattern)
+                lines = text.split('\n')
+                in_transaction_section = False
 
-                    for line in lines:
-                        line = line.strip()
+                for line in lines:
+                    line = line.strip()
 
-                        # Start processing after we see the header
-                        if 'Trans Date' in line and 'Posted Date' in line:
-                            in_transaction_section = True
-                            continue
+                    # Start processing after we see the header
+                    if 'Trans Date' in line and 'Posted Date' in line:
+                        in_transaction_section = True
+                        continue
 
-                        # Stop at Transaction Totals
-                        if 'Transaction Totals:' in line:
-                            in_transaction_section = False
-                            continue
+                    # Stop at Transaction Totals
+                    if 'Transaction Totals:' in line:
+                        in_transaction_section = False
+                        continue
 
-                        if not in_transaction_section or len(line) < 10:
-                            continue
+                    if not in_transaction_section or len(line) < 10:
+                        continue
 
-                        # Try to extract transaction data from line
-                        transaction = self._parse_car_line(
-                            line,
-                            page_num,
-                            current_employee_info
-                        )
+                    # Try to extract transaction data from line
+                    transaction = self._parse_car_line(
+                        line,
+                        page_num,
+                        current_employee_info
+                    )
 
-                        if transaction:
-                            transactions.append(transaction)
+                    if transaction:
+                        transactions.append(transaction)
 
+        except FileNotFoundError:
+            raise
         except Exception as e:
             raise ExtractionError(f"Failed to extract CAR transactions: {str(e)}")
 
@@ -215,22 +294,23 @@ class ExtractionService:
             List of ExtractedTransaction objects
 
         Raises:
+            FileNotFoundError: If the PDF file does not exist
             ExtractionError: If extraction fails
         """
         transactions = []
 
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                for page_num, page in enumerate(pdf.pages, start=1):
-                    text = page.extract_text()
-                    if not text:
-                        continue
+            for page_num, text in self.extract_page_texts(pdf_path):
+                if not text:
+                    continue
 
-                    # Try to extract a transaction from this page
-                    transaction = self._parse_receipt_page(text, page_num)
-                    if transaction:
-                        transactions.append(transaction)
+                # Try to extract a transaction from this page
+                transaction = self._parse_receipt_page(text, page_num)
+                if transaction:
+                    transactions.append(transaction)
 
+        except FileNotFoundError:
+            raise
         except Exception as e:
             raise ExtractionError(f"Failed to extract receipt transactions: {str(e)}")
 
@@ -345,5 +425,14 @@ class ExtractionService:
             raise ValueError(f"Invalid pdf_type: {pdf_type}. Must be 'car' or 'receipt'.")
 
 
+def _extract_page_range_texts(pdf_path: str, start: int, end: int) -> List[Tuple[int, Optional[str]]]:
+    """Process-pool entry point: extract text for pages [start, end) (0-indexed)."""
+    with _open_pdf(pdf_path) as pdf:
+        return [
+            (page_index + 1, pdf.pages[page_index].extract_text())
+            for page_index in range(start, end)
+        ]
+
+
 # Singleton instance
 extraction_service = ExtractionService()
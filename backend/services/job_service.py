@@ -0,0 +1,133 @@
+"""
+Background job tracking for long-running extraction and export work.
+"""
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+import threading
+import uuid
+
+
+class Job:
+    """State of a single background job."""
+
+    def __init__(self, job_type: str, params: Optional[Dict[str, Any]] = None):
+        self.id = str(uuid.uuid4())
+        self.job_type = job_type  # 'extraction' or 'export'
+        self.params = params or {}
+        self.state = "queued"  # 'queued', 'running', 'completed', 'failed'
+        self.result: Optional[Any] = None
+        self.error: Optional[Any] = None
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+    def to_dict(self):
+        """Convert job to dictionary for API responses."""
+        return {
+            "job_id": self.id,
+            "job_type": self.job_type,
+            "params": self.params,
+            "state": self.state,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None
+        }
+
+
+class JobService:
+    """
+    In-process registry of background jobs.
+
+    Jobs are executed via FastAPI BackgroundTasks after the response is sent;
+    clients poll the job status instead of holding the request open.
+    """
+
+    # Oldest finished jobs are dropped once the registry exceeds this size
+    MAX_JOBS = 1000
+
+    def __init__(self):
+        """Initialize empty job registry."""
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def create_job(self, job_type: str, params: Optional[Dict[str, Any]] = None) -> Job:
+        """
+        Register a new queued job.
+
+        Args:
+            job_type: Kind of work ('extraction' or 'export')
+            params: Job parameters echoed back in status responses
+
+        Returns:
+            The created Job
+        """
+        job = Job(job_type, params)
+
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+
+        return job
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID, or None if unknown (or pruned)."""
+        return self._jobs.get(job_id)
+
+    def find_latest_job(self, job_type: str, **params: Any) -> Optional[Job]:
+        """
+        Get the most recently created job of a type whose params match.
+
+        Args:
+            job_type: Kind of work ('extraction' or 'export')
+            **params: Param values the job must have (e.g. pdf_id=...)
+
+        Returns:
+            Newest matching Job, or None
+        """
+        with self._lock:
+            jobs = list(self._jobs.values())
+
+        for job in reversed(jobs):
+            if job.job_type == job_type and all(
+                job.params.get(key) == value for key, value in params.items()
+            ):
+                return job
+
+        return None
+
+    def mark_running(self, job_id: str):
+        """Mark a job as started."""
+        job = self._jobs[job_id]
+        job.state = "running"
+        job.started_at = datetime.utcnow()
+
+    def mark_completed(self, job_id: str, result: Any = None):
+        """Mark a job as finished successfully and store its result."""
+        job = self._jobs[job_id]
+        job.state = "completed"
+        job.result = result
+        job.finished_at = datetime.utcnow()
+
+    def mark_failed(self, job_id: str, error: Any):
+        """Mark a job as failed and store the error detail."""
+        job = self._jobs[job_id]
+        job.state = "failed"
+        job.error = error
+        job.finished_at = datetime.utcnow()
+
+    def _prune(self):
+        """Drop the oldest finished jobs while over MAX_JOBS. Caller holds the lock."""
+        if len(self._jobs) <= self.MAX_JOBS:
+            return
+
+        for job_id in [jid for jid, j in self._jobs.items() if j.finished_at]:
+            if len(self._jobs) <= self.MAX_JOBS:
+                break
+            del self._jobs[job_id]
+
+
+# Singleton instance
+job_service = JobService()
@@ -2,6 +2,9 @@ from typing import List, Dict, Tuple, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass
 from rapidfuzz import fuzz
+import math
+
+from services import process_pool
 
 
 @dataclass
@@ -31,6 +34,9 @@ class MatchingService:
     AMOUNT_TOLERANCE = 0.01  # $0.01 tolerance for floating point comparison
     FUZZY_MATCH_THRESHOLD = 80  # Minimum fuzzy match score for merchant names
 
+    # Scoring is spread over the shared process pool in blocks of CAR transactions
+    MIN_CARS_PER_TASK = 64
+
     def __init__(self):
         """Initialize matching service."""
         pass
@@ -232,6 +238,52 @@ class MatchingService:
         if min_confidence is None:
             min_confidence = self.CONFIDENCE_THRESHOLD
 
+        workers = process_pool.get_max_workers(len(car_transactions) // self.MIN_CARS_PER_TASK)
+
+        if workers <= 1:
+            matches = self.score_block(car_transactions, receipt_transactions, min_confidence)
+        else:
+            # One block per worker, so the receipt list is pickled at most
+            # once per worker per run
+            cars_per_task = math.ceil(len(car_transactions) / workers)
+            executor = process_pool.get_executor()
+            futures = [
+                executor.submit(
+                    _score_car_block,
+                    car_transactions[start:start + cars_per_task],
+                    receipt_transactions,
+                    min_confidence
+                )
+                for start in range(0, len(car_transactions), cars_per_task)
+            ]
+
+            # Collected in submission order, so ties sort exactly as serially
+            matches = []
+            for future in futures:
+                matches.extend(future.result())
+
+        # Sort by confidence score (highest first)
+        matches.sort(key=lambda x: x.confidence_score, reverse=True)
+
+        return matches
+
+    def score_block(
+        self,
+        car_transactions: List[Dict],
+        receipt_transactions: List[Dict],
+        min_confidence: float
+    ) -> List[MatchScore]:
+        """
+        Score every CAR/receipt pair in a block of CAR transactions.
+
+        Args:
+            car_transactions: List of CAR transaction dictionaries
+            receipt_transactions: List of receipt transaction dictionaries
+            min_confidence: Minimum confidence threshold
+
+        Returns:
+            List of MatchScore objects above the threshold, in CAR order
+        """
         matches = []
 
         # Compare each CAR transaction with each receipt transaction
@@ -244,9 +296,6 @@ class MatchingService:
                 if match_score.confidence_score >= min_confidence:
                     matches.append(match_score)
 
-        # Sort by confidence score (highest first)
-        matches.sort(key=lambda x: x.confidence_score, reverse=True)
-
         return matches
 
     def find_best_matches(
@@ -296,5 +345,14 @@ class MatchingService:
         return best_matches
 
 
+def _score_car_block(
+    car_transactions: List[Dict],
+    receipt_transactions: List[Dict],
+    min_confidence: float
+) -> List[MatchScore]:
+    """Process-pool entry point: score one block of CAR transactions."""
+    return matching_service.score_block(car_transactions, receipt_transactions, min_confidence)
+
+
 # Singleton instance
 matching_service = MatchingService()
@@ -1,13 +1,38 @@
 from pathlib import Path
 import pdfplumber
 from PyPDF2 import PdfReader
-from typing import Literal, Tuple, Optional
+from typing import BinaryIO, Literal, Tuple, Optional
 from sqlalchemy.orm import Session
+from tempfile import SpooledTemporaryFile
+import asyncio
+import errno
+import io
+import mmap
 import shutil
 import uuid
 import os
 
 
+def _in_memory_spool(fileobj) -> bool:
+    """Whether fileobj is a SpooledTemporaryFile that has not rolled over to disk."""
+    if not isinstance(fileobj, SpooledTemporaryFile):
+        return False
+    # The spool buffers in a BytesIO until rollover; if that internal ever
+    # changes, treat it as on disk and let fileno() force the rollover
+    return isinstance(getattr(fileobj, "_file", None), io.BytesIO)
+
+
+def _disk_fileno(fileobj) -> Optional[int]:
+    """File descriptor of an upload backed by a disk file; None if it is in memory."""
+    # fileno() would force an in-memory spool onto disk, so check first
+    if _in_memory_spool(fileobj):
+        return None
+    try:
+        return fileobj.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return None
+
+
 class PDFValidationError(Exception):
     """Custom exception for PDF validation errors."""
     pass
@@ -20,6 +45,7 @@ class PDFService:
     MAX_FILE_SIZE_MB = 300
     MAX_PAGE_COUNT = 1500
     MIN_PAGE_COUNT = 1
+    UPLOAD_CHUNK_BYTES = 1024 * 1024  # Copy/hash uploads in 1 MiB chunks
     UPLOAD_DIR = Path(os.getenv("UPLOAD_DIR", "uploads"))
 
     def __init__(self):
@@ -128,6 +154,12 @@ class PDFService:
             PDFValidationError: If file too large
         """
         file_size = file_path.stat().st_size
+        self._check_file_size(file_size)
+
+        return file_size
+
+    def _check_file_size(self, file_size: int):
+        """Raise PDFValidationError if file_size exceeds MAX_FILE_SIZE_MB."""
         max_size_bytes = self.MAX_FILE_SIZE_MB * 1024 * 1024
 
         if file_size > max_size_bytes:
@@ -136,35 +168,46 @@ class PDFService:
                 f"maximum {self.MAX_FILE_SIZE_MB} MB."
             )
 
-        return file_size
+    async def hash_upload(self, file) -> Tuple[int, str]:
+        """
+        Hash an upload and check its size without writing it anywhere.
+
+        Lets the caller look up duplicates before the file is persisted.
+
+        Args:
+            file: FastAPI UploadFile object
+
+        Returns:
+            Tuple of (file_size_bytes, file_hash)
+
+        Raises:
+            PDFValidationError: If reading fails or the file is too large
+        """
+        # Hashing is blocking; run it in a worker thread so the event loop
+        # keeps serving requests
+        return await asyncio.to_thread(self._hash_upload, file.file)
 
     async def save_uploaded_file(
         self,
         file,  # FastAPI UploadFile
         pdf_type: Literal["car", "receipt"]
-    ) -> Tuple[Path, str, int, int, str]:
+    ) -> Tuple[Path, str]:
         """
-        Save uploaded file to disk with validation.
+        Save uploaded file to disk.
+
+        The upload is hashed beforehand by hash_upload and the PDF is
+        checked afterwards by validate_saved_file.
 
         Args:
             file: FastAPI UploadFile object
             pdf_type: Type of PDF ('car' or 'receipt')
 
         Returns:
-            Tuple of (file_path, filename, page_count, file_size_bytes, file_hash)
+            Tuple of (file_path, filename)
 
         Raises:
-            PDFValidationError: If validation fails
+            PDFValidationError: If saving fails
         """
-        # Import here to avoid circular dependency
-        from services.deduplication_service import deduplication_service
-
-        # Read file content first (needed for hash calculation)
-        file_content = await file.read()
-
-        # Calculate hash before any other operations
-        file_hash = deduplication_service.calculate_file_hash_from_bytes(file_content)
-
         # Generate unique filename
         file_id = str(uuid.uuid4())
         original_filename = file.filename
@@ -182,30 +225,160 @@ class PDFService:
         saved_filename = f"{file_id}{file_extension}"
         file_path = type_dir / saved_filename
 
-        # Save file
+        # Copying is blocking; run it in a worker thread
+        await asyncio.to_thread(self._save_upload, file.file, file_path)
+
+        return file_path, original_filename
+
+    async def validate_saved_file(self, file_path: Path) -> int:
+        """
+        Run the PDF format and text checks on a saved upload.
+
+        Args:
+            file_path: Path returned by save_uploaded_file
+
+        Returns:
+            Page count
+
+        Raises:
+            PDFValidationError: If validation fails
+        """
+        # PyPDF2/pdfplumber parsing is blocking; run it in a worker thread
+        return await asyncio.to_thread(self._validate_saved_file, file_path)
+
+    def _hash_upload(self, fileobj: BinaryIO) -> Tuple[int, str]:
+        """
+        Hash an upload in place and check its size.
+
+        The size is checked before anything is hashed. Uploads Starlette
+        already spooled to disk are hashed through an mmap of the spool
+        file; in-memory uploads are hashed in chunks.
+
+        Args:
+            fileobj: Uploaded file object (e.g. UploadFile.file)
+
+        Returns:
+            Tuple of (file_size_bytes, file_hash)
+
+        Raises:
+            PDFValidationError: If reading fails or the file is too large
+        """
+        # Import here to avoid circular dependency
+        from services.deduplication_service import deduplication_service
+
         try:
+            # Seeking also flushes buffered writes to a disk spool
+            file_size = fileobj.seek(0, io.SEEK_END)
+            fileobj.seek(0)
+            self._check_file_size(file_size)
+
+            hasher = deduplication_service.create_file_hasher(file_size)
+            src_fd = _disk_fileno(fileobj)
+            if src_fd is not None:
+                if file_size:
+                    with mmap.mmap(src_fd, file_size, access=mmap.ACCESS_READ) as mapped:
+                        hasher.update(mapped)
+            else:
+                while chunk := fileobj.read(self.UPLOAD_CHUNK_BYTES):
+                    hasher.update(chunk)
+            fileobj.seek(0)
+        except PDFValidationError:
+            raise
+        except Exception as e:
+            raise PDFValidationError(f"Failed to read file: {str(e)}")
+
+        return file_size, hasher.hexdigest()
+
+    def _save_upload(self, fileobj: BinaryIO, file_path: Path):
+        """
+        Stream an upload to disk.
+
+        Uploads Starlette already spooled to disk are copied in the kernel
+        with sendfile(2), so their bytes never pass through Python buffers.
+        In-memory uploads are copied in chunks.
+
+        Args:
+            fileobj: Uploaded file object (e.g. UploadFile.file)
+            file_path: Destination path
+
+        Raises:
+            PDFValidationError: If saving fails
+        """
+        try:
+            fileobj.seek(0)
             with open(file_path, "wb") as buffer:
-                buffer.write(file_content)
+                src_fd = _disk_fileno(fileobj)
+                if src_fd is None or not self._copy_in_kernel(src_fd, buffer.fileno()):
+                    shutil.copyfileobj(fileobj, buffer, self.UPLOAD_CHUNK_BYTES)
         except Exception as e:
             raise PDFValidationError(f"Failed to save file: {str(e)}")
 
-        # Validate file size
-        file_size = self.validate_file_size(file_path)
+    def _copy_in_kernel(self, src_fd: int, dst_fd: int) -> bool:
+        """
+        Copy a file with sendfile(2).
+
+        Args:
+            src_fd: Source file descriptor (read from offset 0)
+            dst_fd: Destination file descriptor (empty, opened for writing)
+
+        Returns:
+            True if copied, False if sendfile is unavailable for these files
+            (nothing has been written then)
+        """
+        if not hasattr(os, "sendfile"):
+            return False
 
+        size = os.fstat(src_fd).st_size
+        offset = 0
+        try:
+            while offset < size:
+                sent = os.sendfile(dst_fd, src_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+        except OSError as e:
+            if offset == 0 and e.errno in (errno.EINVAL, errno.ENOSYS, errno.EOPNOTSUPP):
+                return False
+            raise
+
+        return True
+
+    def _validate_saved_file(self, file_path: Path) -> int:
+        """Validate PDF format and text extractability; returns the page count."""
         # Validate PDF format
         page_count, _ = self.validate_pdf_format(file_path)
 
         # Validate text extractability
         self.validate_text_extractable(file_path)
 
-        return file_path, original_filename, page_count, file_size, file_hash
+        self._drop_page_cache(file_path)
+
+        return page_count
+
+    def _drop_page_cache(self, file_path: Path):
+        """
+        Ask the kernel to evict a saved upload from the page cache.
+
+        Extraction runs later (if at all) and prefetches the file itself, so
+        keeping up to MAX_FILE_SIZE_MB of freshly written pages cached would
+        only push out hotter data such as the SQLite database.
+        """
+        if not hasattr(os, "posix_fadvise"):
+            return
+
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            # Dirty pages are queued for writeback and dropped once clean
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        finally:
+            os.close(fd)
 
     def find_duplicate_pdf(self, file_hash: str, db: Session) -> Optional['PDF']:
         """
         Find PDF by hash.
 
         Args:
-            file_hash: SHA-256 hash of PDF content
+            file_hash: BLAKE3 hash of PDF content
             db: Database session
 
         Returns:
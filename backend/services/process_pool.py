@@ -0,0 +1,75 @@
+"""
+Process pool shared by the CPU-bound services.
+
+Page text extraction, match scoring and batch PDF merging all submit to the
+same lazily created pool, so a server process never runs more than
+MAX_WORKERS worker processes in total.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import multiprocessing
+import os
+import threading
+
+# Upper bound on worker processes per server process
+MAX_WORKERS = max(1, int(os.getenv("PROCESS_POOL_WORKERS", os.cpu_count() or 1)))
+
+# Memory budgeted per busy worker (a parsed PDF page range or a merge)
+WORKER_MEMORY_BYTES = 512 * 1024 * 1024
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _available_memory_bytes() -> Optional[int]:
+    """Physical memory currently available, or None if the platform can't tell."""
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def get_max_workers(task_count: Optional[int] = None) -> int:
+    """
+    Number of workers worth using for a job.
+
+    Args:
+        task_count: Most tasks the job can be split into (e.g. page count
+            divided by the minimum pages per task)
+
+    Returns:
+        min(MAX_WORKERS, task_count, available memory / WORKER_MEMORY_BYTES),
+        at least 1
+    """
+    workers = MAX_WORKERS
+
+    available = _available_memory_bytes()
+    if available is not None:
+        workers = min(workers, available // WORKER_MEMORY_BYTES)
+
+    if task_count is not None:
+        workers = min(workers, task_count)
+
+    return max(1, workers)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """Get the shared process pool, creating it on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned workers avoid forking a multi-threaded server process
+            _executor = ProcessPoolExecutor(
+                max_workers=MAX_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _executor
+
+
+def shutdown_executor():
+    """Stop the shared pool's worker processes (call on application shutdown)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=True, cancel_futures=True)
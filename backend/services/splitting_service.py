@@ -5,12 +5,19 @@ from datetime import datetime
 import uuid
 import os
 
+from services import process_pool
+
 
 class SplittingError(Exception):
     """Custom exception for PDF splitting errors."""
     pass
 
 
+class SourcePDFNotFoundError(SplittingError):
+    """Raised when a source PDF is missing from disk."""
+    pass
+
+
 class SplittingService:
     """Service for splitting and combining PDFs based on matches."""
 
@@ -36,6 +43,7 @@ class SplittingService:
             PdfWriter with extracted pages
 
         Raises:
+            SourcePDFNotFoundError: If the source PDF does not exist
             SplittingError: If extraction fails
         """
         try:
@@ -57,6 +65,8 @@ class SplittingService:
 
         except SplittingError:
             raise
+        except FileNotFoundError:
+            raise SourcePDFNotFoundError(f"Source PDF not found on disk: {pdf_path}")
         except Exception as e:
             raise SplittingError(f"Failed to extract pages: {str(e)}")
 
@@ -164,17 +174,24 @@ class SplittingService:
         Raises:
             SplittingError: If any PDF creation fails
         """
+        if process_pool.get_max_workers(len(matches_data)) > 1:
+            # Each match is an independent, CPU-bound merge - run them in parallel
+            executor = process_pool.get_executor()
+            outcomes = [
+                executor.submit(_create_match_pdf_from_data, match_data)
+                for match_data in matches_data
+            ]
+        else:
+            outcomes = None
+
         results = []
 
-        for match_data in matches_data:
+        for index, match_data in enumerate(matches_data):
             try:
-                output_path, total_pages = self.create_match_pdf(
-                    car_pdf_path=match_data['car_pdf_path'],
-                    car_page_numbers=match_data['car_pages'],
-                    receipt_pdf_path=match_data['receipt_pdf_path'],
-                    receipt_page_numbers=match_data['receipt_pages'],
-                    match_id=match_data['match_id']
-                )
+                if outcomes is not None:
+                    output_path, total_pages = outcomes[index].result()
+                else:
+                    output_path, total_pages = _create_match_pdf_from_data(match_data)
 
                 results.append((match_data['match_id'], output_path, total_pages))
 
@@ -196,10 +213,8 @@ class SplittingService:
             True if deleted, False if file didn't exist
         """
         try:
-            if export_path.exists():
-                export_path.unlink()
-                return True
-            return False
+            export_path.unlink()
+            return True
         except Exception:
             return False
 
@@ -271,3 +286,18 @@ class SplittingService:
 
 # Singleton instance
 splitting_service = SplittingService()
+
+
+def _create_match_pdf_from_data(match_data: dict) -> Tuple[Path, int]:
+    """
+    Create one match PDF from a create_batch_pdfs entry.
+
+    Module-level so it can be pickled to batch export worker processes.
+    """
+    return splitting_service.create_match_pdf(
+        car_pdf_path=match_data['car_pdf_path'],
+        car_page_numbers=match_data['car_pages'],
+        receipt_pdf_path=match_data['receipt_pdf_path'],
+        receipt_page_numbers=match_data['receipt_pages'],
+        match_id=match_data['match_id']
+    )
@@ -257,9 +257,9 @@ class TestEdgeCases:
         # Should produce valid hash
         assert len(file_hash) == 64
 
-        # Should match known SHA-256 of empty string
-        import hashlib
-        expected = hashlib.sha256(b"").hexdigest()
+        # Should match known BLAKE3 of empty string
+        import blake3
+        expected = blake3.blake3(b"").hexdigest()
         assert file_hash == expected
 
     def test_very_large_amount_in_fingerprint(self, db_session):
@@ -177,6 +177,28 @@ class TestDeduplicationManagement:
 
         assert result is None
 
+    def test_check_pdf_by_hash(self, db_session):
+        """Should answer 200 with the PDF ID for a stored hash, else 404."""
+        from api.routes.deduplication import check_pdf_by_hash
+
+        existing = PDF(
+            filename="existing.pdf",
+            file_path="/existing.pdf",
+            file_hash="a" * 64,
+            pdf_type="car",
+            page_count=3,
+            file_size_bytes=600
+        )
+        db_session.add(existing)
+        db_session.commit()
+
+        found = check_pdf_by_hash("A" * 64, db_session)
+        missing = check_pdf_by_hash("b" * 64, db_session)
+
+        assert found.status_code == 200
+        assert found.headers["X-PDF-Id"] == existing.id
+        assert missing.status_code == 404
+
     def test_find_duplicate_transactions(self, db_session):
         """Should find all duplicate transaction groups."""
         from services.deduplication_service import deduplication_service
@@ -228,6 +250,85 @@ class TestDeduplicationManagement:
         assert our_group is not None
         assert len(our_group[1]) == 3  # All 3 transactions
 
+    def test_find_duplicate_transactions_honors_etag(self, db_session):
+        """Should return 304 when If-None-Match matches the current ETag."""
+        from fastapi import Request, Response
+        from api.routes.deduplication import find_duplicate_transactions
+
+        db_session.add(Transaction(
+            pdf_id="pdf-1",
+            transaction_type="car",
+            date=date(2025, 1, 15),
+            amount=100.00,
+            employee_id="EMP001",
+            page_number=1,
+            content_fingerprint="fp_etag"
+        ))
+        db_session.commit()
+
+        response = Response()
+        request = Request({"type": "http", "headers": []})
+        payload = find_duplicate_transactions(request, response, db_session)
+        etag = response.headers["ETag"]
+
+        assert payload["total_groups"] == 0
+
+        request = Request({"type": "http", "headers": [(b"if-none-match", etag.encode())]})
+        not_modified = find_duplicate_transactions(request, Response(), db_session)
+
+        assert not_modified.status_code == 304
+
+        db_session.add(Transaction(
+            pdf_id="pdf-2",
+            transaction_type="car",
+            date=date(2025, 1, 16),
+            amount=100.00,
+            employee_id="EMP001",
+            page_number=1,
+            content_fingerprint="fp_etag"
+        ))
+        db_session.commit()
+
+        response = Response()
+        payload = find_duplicate_transactions(request, response, db_session)
+
+        assert response.headers["ETag"] != etag
+        assert payload["total_groups"] == 1
+
+    def test_find_duplicate_transactions_etag_tracks_same_second_updates(self, db_session):
+        """Should change the ETag for bulk updates within the same second."""
+        from fastapi import Request, Response
+        from api.routes.deduplication import find_duplicate_transactions
+
+        db_session.add_all([
+            Transaction(
+                pdf_id=f"pdf-{i}",
+                transaction_type="car",
+                date=date(2025, 1, 15 + i),
+                amount=100.00,
+                employee_id="EMP001",
+                page_number=1,
+                content_fingerprint="fp_same_second"
+            )
+            for i in range(2)
+        ])
+        db_session.commit()
+
+        request = Request({"type": "http", "headers": []})
+        etags = []
+        for is_matched in (True, False):
+            db_session.query(Transaction).update({Transaction.is_matched: is_matched})
+            db_session.commit()
+
+            response = Response()
+            payload = find_duplicate_transactions(request, response, db_session)
+            etags.append(response.headers["ETag"])
+
+            rows = payload["duplicate_groups"][0]["transactions"]
+            assert [row["is_matched"] for row in rows] == [is_matched, is_matched]
+
+        assert etags[0] != etags[1]
+
     def test_delete_duplicate_transaction_blocks_matched(self, db_session):
         """Should prevent deletion of matched transaction without force flag."""
         # Create matched transaction
@@ -7,18 +7,22 @@ import pytest
 from datetime import date, datetime
 from pathlib import Path
 import tempfile
-import hashlib
+import blake3
+import asyncio
+from io import BytesIO
+
+from fastapi import UploadFile
 
 from services.deduplication_service import DeduplicationService, DuplicateDetectedError
 from models.pdf import PDF
-from models.transaction import Transaction
+from models.transaction import Transaction, Match
 
 
 class TestFileHashing:
     """Test file hash calculation."""
 
     def test_calculate_file_hash_from_bytes(self):
-        """Should calculate SHA-256 hash from byte content."""
+        """Should calculate BLAKE3 hash from byte content."""
         service = DeduplicationService()
         content = b"Test PDF content"
 
@@ -28,12 +32,12 @@ class TestFileHashing:
         assert len(hash_result) == 64
         assert all(c in '0123456789abcdef' for c in hash_result)
 
-        # Verify it matches expected SHA-256
-        expected = hashlib.sha256(content).hexdigest()
+        # Verify it matches expected BLAKE3
+        expected = blake3.blake3(content).hexdigest()
         assert hash_result == expected
 
     def test_calculate_file_hash_from_file(self):
-        """Should calculate SHA-256 hash from file path."""
+        """Should calculate BLAKE3 hash from file path."""
         service = DeduplicationService()
 
         # Create temporary file
@@ -46,11 +50,31 @@ class TestFileHashing:
             hash_result = service.calculate_file_hash(temp_path)
 
             # Verify hash matches expected
-            expected = hashlib.sha256(test_content).hexdigest()
+            expected = blake3.blake3(test_content).hexdigest()
             assert hash_result == expected
         finally:
             temp_path.unlink()
 
+    def test_calculate_file_hash_detects_modified_file(self):
+        """Should not return a cached hash after the file changes."""
+        service = DeduplicationService()
+
+        with tempfile.NamedTemporaryFile(delete=False, mode='wb') as f:
+            f.write(b"Original content")
+            temp_path = Path(f.name)
+
+        try:
+            original_hash = service.calculate_file_hash(temp_path)
+            assert service.calculate_file_hash(temp_path) == original_hash
+
+            temp_path.write_bytes(b"Modified content, different size")
+
+            assert service.calculate_file_hash(temp_path) == blake3.blake3(
+                b"Modified content, different size"
+            ).hexdigest()
+        finally:
+            temp_path.unlink()
+
     def test_identical_content_produces_same_hash(self):
         """Should produce identical hash for identical content."""
         service = DeduplicationService()
@@ -70,6 +94,32 @@ class TestFileHashing:
 
         assert hash1 != hash2
 
+    def test_calculate_file_hash_from_stream(self):
+        """Should calculate same BLAKE3 hash when streaming an upload."""
+        service = DeduplicationService()
+        content = b"Streamed PDF content " * 1000
+        upload = UploadFile(file=BytesIO(content), filename="streamed.pdf")
+
+        hash_result = asyncio.run(service.calculate_file_hash_from_stream(upload))
+
+        assert hash_result == blake3.blake3(content).hexdigest()
+
+    def test_calculate_file_hash_from_fileobj_ignores_position(self, tmp_path):
+        """Should hash the whole content of in-memory and on-disk file objects alike."""
+        service = DeduplicationService()
+        content = b"Partially read PDF content " * 1000
+        file_path = tmp_path / "partial.pdf"
+        file_path.write_bytes(content)
+
+        in_memory = BytesIO(content)
+        in_memory.read(100)
+        with open(file_path, 'rb') as on_disk:
+            on_disk.read(100)
+            disk_hash = service.calculate_file_hash_from_fileobj(on_disk)
+
+        assert service.calculate_file_hash_from_fileobj(in_memory) == blake3.blake3(content).hexdigest()
+        assert disk_hash == blake3.blake3(content).hexdigest()
+
 
 class TestTransactionFingerprinting:
     """Test transaction fingerprint calculation."""
@@ -328,6 +378,77 @@ class TestDatabaseDuplicateChecks:
 
         assert result is None
 
+    def test_check_duplicate_pdf_caches_hits(self, db_session):
+        """Should answer a repeated hit from the cache without querying."""
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        service = DeduplicationService()
+        db_session.add(PDF(
+            filename="original.pdf",
+            file_path="/path/to/original.pdf",
+            file_hash="abc123hash",
+            pdf_type="car",
+            page_count=5,
+            file_size_bytes=1000
+        ))
+        db_session.commit()
+        first = service.check_duplicate_pdf("abc123hash", db_session)
+
+        statements = []
+        engine = db_session.get_bind()
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        with Session(bind=engine) as other_session:
+            result = service.check_duplicate_pdf("abc123hash", other_session)
+
+            assert statements == []
+            assert result in other_session
+            assert result.to_dict() == first.to_dict()
+
+    def test_create_pdf_if_new_skips_existing_hash(self, db_session):
+        """Should insert a new PDF once and return None for the same hash."""
+        service = DeduplicationService()
+        fields = dict(
+            filename="test.pdf",
+            file_path="/uploads/test.pdf",
+            file_hash="abc123",
+            pdf_type="car",
+            page_count=5,
+            file_size_bytes=1000
+        )
+
+        created = service.create_pdf_if_new(db_session, **fields)
+        duplicate = service.create_pdf_if_new(db_session, **{**fields, "pdf_type": "receipt"})
+
+        assert created is not None
+        assert created.uploaded_at is not None
+        assert duplicate is None
+        stored = db_session.query(PDF).one()
+        assert stored.id == created.id
+        assert stored.pdf_type == "car"
+
+    def test_check_duplicate_by_prefix(self, db_session):
+        """Should only return candidates with same size and prefix hash."""
+        service = DeduplicationService()
+        content = b"%PDF-1.4 prefix content" * 10000
+        prefix_hash = service.calculate_prefix_hash(BytesIO(content))
+
+        existing_pdf = PDF(
+            filename="original.pdf",
+            file_path="/path/to/original.pdf",
+            file_hash=service.calculate_file_hash_from_bytes(content),
+            prefix_hash=prefix_hash,
+            pdf_type="car",
+            page_count=5,
+            file_size_bytes=len(content)
+        )
+        db_session.add(existing_pdf)
+        db_session.commit()
+
+        assert service.check_duplicate_by_prefix(len(content), prefix_hash, db_session) is not None
+        assert service.check_duplicate_by_prefix(len(content) + 1, prefix_hash, db_session) is None
+        assert service.check_duplicate_by_prefix(len(content), "other", db_session) is None
+
     def test_check_duplicate_transaction_by_fingerprint(self, db_session):
         """Should find existing transaction with same fingerprint."""
         service = DeduplicationService()
@@ -351,6 +472,26 @@ class TestDatabaseDuplicateChecks:
         assert result is not None
         assert result.id == existing.id
 
+    def test_check_duplicates_bulk(self, db_session):
+        """Should map existing fingerprints to transaction IDs in one lookup."""
+        service = DeduplicationService()
+
+        existing = Transaction(
+            pdf_id="pdf-1",
+            transaction_type="car",
+            date=date(2025, 1, 15),
+            amount=100.00,
+            employee_id="EMP001",
+            page_number=1,
+            content_fingerprint="fp_existing"
+        )
+        db_session.add(existing)
+        db_session.commit()
+
+        result = service.check_duplicates_bulk(["fp_existing", "fp_new", "fp_existing"], db_session)
+
+        assert result == {"fp_existing": existing.id}
+
     def test_check_duplicate_transaction_by_fields(self, db_session):
         """Should find duplicate by business key fields."""
         service = DeduplicationService()
@@ -419,6 +560,54 @@ class TestDatabaseDuplicateChecks:
         assert duplicate.duplicate_of_id == original.id
 
 
+    def test_reset_pdf_transactions(self, db_session):
+        """Should count, then clear matches of a PDF's transactions and reset is_matched."""
+        service = DeduplicationService()
+
+        car = Transaction(
+            pdf_id="pdf-car",
+            transaction_type="car",
+            date=date(2025, 1, 15),
+            amount=100.00,
+            employee_id="EMP001",
+            page_number=1,
+            is_matched=True
+        )
+        receipts = [
+            Transaction(
+                pdf_id="pdf-receipt",
+                transaction_type="receipt",
+                date=date(2025, 1, day),
+                amount=100.00,
+                page_number=day,
+                is_matched=day == 15
+            )
+            for day in (15, 16)
+        ]
+        db_session.add_all([car, *receipts])
+        db_session.flush()
+        db_session.add(Match(
+            car_transaction_id=car.id,
+            receipt_transaction_id=receipts[0].id,
+            confidence_score=0.9,
+            date_score=1.0,
+            amount_score=1.0
+        ))
+        db_session.commit()
+
+        assert service.count_pdf_transactions_and_matches("pdf-receipt", db_session) == (2, 1)
+        assert service.count_pdf_transactions_and_matches("pdf-car", db_session) == (1, 1)
+
+        transaction_count, matches_cleared = service.reset_pdf_transactions("pdf-receipt", db_session)
+
+        assert transaction_count == 2
+        assert matches_cleared == 1
+        assert db_session.query(Match).count() == 0
+        assert db_session.query(Transaction).filter(
+            Transaction.pdf_id == "pdf-receipt",
+            Transaction.is_matched == True
+        ).count() == 0
+
 # Pytest fixtures
 @pytest.fixture
 def db_session():
@@ -0,0 +1,72 @@
+"""
+Unit tests for background job tracking.
+"""
+from services.job_service import JobService
+
+
+class TestJobLifecycle:
+    """Test job state transitions."""
+
+    def test_create_job_is_queued(self):
+        """Should register new jobs in queued state."""
+        service = JobService()
+
+        job = service.create_job("extraction", {"pdf_id": "pdf-1"})
+
+        assert service.get_job(job.id) is job
+        assert job.state == "queued"
+        assert job.to_dict()["params"] == {"pdf_id": "pdf-1"}
+
+    def test_completed_job_stores_result(self):
+        """Should store result when job completes."""
+        service = JobService()
+        job = service.create_job("extraction")
+
+        service.mark_running(job.id)
+        service.mark_completed(job.id, {"total_count": 3})
+
+        assert job.state == "completed"
+        assert job.result == {"total_count": 3}
+        assert job.started_at is not None
+        assert job.finished_at is not None
+
+    def test_failed_job_stores_error(self):
+        """Should store error detail when job fails."""
+        service = JobService()
+        job = service.create_job("export")
+
+        service.mark_failed(job.id, "No matches found")
+
+        assert job.state == "failed"
+        assert job.error == "No matches found"
+
+    def test_unknown_job_returns_none(self):
+        """Should return None for unknown job IDs."""
+        service = JobService()
+
+        assert service.get_job("missing") is None
+
+    def test_prunes_oldest_finished_jobs(self):
+        """Should drop oldest finished jobs once over capacity."""
+        service = JobService()
+        service.MAX_JOBS = 2
+
+        first = service.create_job("extraction")
+        service.mark_completed(first.id)
+        second = service.create_job("extraction")
+        third = service.create_job("extraction")
+
+        assert service.get_job(first.id) is None
+        assert service.get_job(second.id) is second
+        assert service.get_job(third.id) is third
+
+    def test_find_latest_job_by_params(self):
+        """Should return the newest job of a type with matching params."""
+        service = JobService()
+
+        service.create_job("extraction", {"pdf_id": "pdf-1"})
+        service.create_job("extraction", {"pdf_id": "pdf-2"})
+        newer = service.create_job("extraction", {"pdf_id": "pdf-1"})
+
+        assert service.find_latest_job("extraction", pdf_id="pdf-1") is newer
+        assert service.find_latest_job("export", pdf_id="pdf-1") is None
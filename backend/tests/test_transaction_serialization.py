@@ -0,0 +1,121 @@
+"""
+Tests for Transaction and Match response serialization.
+
+The extraction and matching endpoints build response dicts directly from ORM
+rows; they must stay identical to the Pydantic schema output.
+"""
+import json
+import pytest
+from datetime import date
+
+from models.pdf import PDF
+from models.transaction import Transaction, Match
+from schemas.transaction import TransactionResponse, MatchWithTransactionsResponse
+
+
+class TestTransactionResponseDict:
+    """Test Transaction.to_response_dict against the Pydantic schema."""
+
+    def test_matches_schema_serialization(self, db_session):
+        """Should produce the same JSON as TransactionResponse."""
+        db_session.add(PDF(
+            id="pdf-1",
+            filename="car.pdf",
+            file_path="/uploads/car.pdf",
+            pdf_type="car",
+            page_count=1,
+            file_size_bytes=1000
+        ))
+        transaction = Transaction(
+            pdf_id="pdf-1",
+            transaction_type="car",
+            date=date(2025, 1, 15),
+            amount=123.45,
+            employee_id="EMP001",
+            merchant="ACME CORP",
+            page_number=1,
+            extraction_confidence=0.95
+        )
+        db_session.add(transaction)
+        db_session.commit()
+        db_session.refresh(transaction)
+
+        expected = json.loads(
+            TransactionResponse.model_validate(transaction).model_dump_json(by_alias=True)
+        )
+
+        assert transaction.to_response_dict() == expected
+
+    def test_handles_missing_date(self, db_session):
+        """Should serialize a missing date as None."""
+        transaction = Transaction(
+            pdf_id="pdf-1",
+            transaction_type="receipt",
+            page_number=2
+        )
+
+        assert transaction.to_response_dict()["date"] is None
+
+
+class TestMatchResponseDict:
+    """Test Match.to_response_dict against the Pydantic schema."""
+
+    def test_matches_schema_serialization(self, db_session):
+        """Should produce the same JSON as MatchWithTransactionsResponse."""
+        car = Transaction(
+            pdf_id="pdf-1",
+            transaction_type="car",
+            date=date(2025, 1, 15),
+            amount=123.45,
+            employee_id="EMP001",
+            page_number=1
+        )
+        receipt = Transaction(
+            pdf_id="pdf-2",
+            transaction_type="receipt",
+            date=date(2025, 1, 16),
+            amount=123.45,
+            page_number=1
+        )
+        db_session.add_all([car, receipt])
+        db_session.flush()
+
+        match = Match(
+            car_transaction_id=car.id,
+            receipt_transaction_id=receipt.id,
+            confidence_score=0.9,
+            date_score=0.95,
+            amount_score=1.0
+        )
+        db_session.add(match)
+        db_session.commit()
+        db_session.refresh(match)
+
+        expected = json.loads(
+            MatchWithTransactionsResponse.model_validate({
+                **match.to_dict(),
+                "car_transaction": car,
+                "receipt_transaction": receipt
+            }).model_dump_json(by_alias=True)
+        )
+
+        assert match.to_response_dict() == expected
+
+
+# Pytest fixtures
+@pytest.fixture
+def db_session():
+    """Create in-memory SQLite session for testing."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from models.base import Base
+
+    engine = create_engine('sqlite:///:memory:', echo=False)
+    Base.metadata.create_all(engine)
+
+    Session = sessionmaker(bind=engine)
+    session = Session()
+
+    yield session
+
+    session.close()